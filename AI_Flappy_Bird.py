@@ -4,523 +4,692 @@ The classic game of flappy bird. Made with python and pygame. Features pixel per
 
 # Import all the necessary modules
 import pygame
-import random # random is for randomly placing the height of the tubes
+import random # random draws the seed of the course each generation flies, and drives NEAT's mutations
 import os
 import time
 import neat
-import pickle
-pygame.font.init()  # init font
-
-# Setting dimensions of the screen
-WIN_WIDTH = 600
-WIN_HEIGHT = 800
-
-FLOOR = 730
-STAT_FONT = pygame.font.SysFont("bold", 50)
-END_FONT = pygame.font.SysFont("bold", 70)
+import argparse
+import numpy as np
+from collections import namedtuple
+from simulation import (WIN_WIDTH, WIN_HEIGHT, collision_masks, BirdState, PipeState, BaseState, Simulation, 
+                        BatchedSimulation, MultiWorldSimulation, PipeSchedule, collision_stats, BASIC_INPUTS, 
+                        EXTENDED_INPUTS)
+from network import CompiledNetwork, BatchedNetworks
+from checkpoint import Checkpointer, BestGenomeSaver
+from profiling import NULL_TIMER, ProfileReporter, frame_timer
+from assets import IMAGES, assets
+from telemetry import TelemetryReporter, generation_stats
+
+STAT_FONT = None # The fonts are looked up by init_display, headless runs never initialize pygame's font module
+END_FONT = None
 DRAW_LINES = False
 
-WIN = pygame.display.set_mode((WIN_WIDTH, WIN_HEIGHT))
-pygame.display.set_caption("Flappy Bird")
+"""
+Headless training settings. FPS caps the frame rate of the generations that are drawn (None runs them uncapped). 
+RENDER_EVERY draws every Nth generation: 1 draws every generation, 0 never draws, so the whole run stays headless and 
+training speed is only bounded by the simulation and the neural networks.
+"""
+FPS = 30
+RENDER_EVERY = 1
+EVENT_INTERVAL = 100 # Frames between event queue checks while an open window is not being drawn
+BATCHED = True # Step the birds of headless generations as NumPy arrays (see BatchedSimulation)
+WORKERS = 1 # Number of worker processes; above 1 every genome plays its own headless game (see play_genome)
+WORLDS = 1 # Number of courses every genome flies in headless generations; its fitness is the mean over all of them
+SEED = None # Seeds NEAT and every generation's course, so a run can be replayed exactly. None picks a random seed
+PROFILE = False # Time every phase of every frame and print per generation percentiles (see profiling.py)
+TELEMETRY_FILE = None # Append every generation's statistics to this file, as CSV if it ends in .csv (see telemetry.py)
+"""
+Limits that end a generation early, so a generation whose birds have learned to fly forever still ends. MAX_FRAMES and 
+MAX_SCORE end it after that many frames or pipes passed (None for no limit), and STOP_AT_THRESHOLD ends it as soon as a 
+genome reaches the config's fitness_threshold, which ends training anyway (only with fitness_criterion = max).
+"""
+MAX_FRAMES = None
+MAX_SCORE = None
+STOP_AT_THRESHOLD = True
+GENERATIONS = 50 # Number of generations a run trains for, counting the ones a resumed run already finished
 
 """
-Load bird images as a list. bird1, bird2, and bird3 are loaded in sequence to create an animation effect 
-(check imgs folder).
+Training progress is saved as it goes (see checkpoint.py): the population every CHECKPOINT_EVERY generations (0 turns 
+checkpoints off), to files named CHECKPOINT_PREFIX followed by the generation number, and the best genome found so far 
+to BEST_GENOME_FILE every time it improves.
 """
-bird_images = [pygame.transform.scale2x(pygame.image.load(os.path.join("Images", "imgs","bird" + str(x) + ".png"))) 
-               for x in range(1,4)]
+CHECKPOINT_EVERY = 1
+CHECKPOINT_PREFIX = "neat-checkpoint-"
+BEST_GENOME_FILE = "best_genome.pkl"
 
-pipe_img = pygame.transform.scale2x(pygame.image.load(os.path.join("Images", "imgs", "pipe.png")).convert_alpha())
-bg_img = pygame.transform.scale(pygame.image.load(os.path.join("Images", "imgs","bg.png")).convert_alpha(), (600, 900))
-base_img = pygame.transform.scale2x(pygame.image.load(os.path.join("Images", "imgs","base.png")).convert_alpha())
+WIN = None # The display surface is only created once a generation is actually drawn (see init_display)
+
+"""
+The images are loaded by the asset manager (see assets.py) when the window is opened by init_display, and converted to 
+the display's pixel format there, because convert_alpha() needs a video mode to be set. Headless runs never load them, 
+apart from the few the collision masks are built from.
+"""
+bg_img = None
 
 gen = 0
 
+"""
+The Bird, Pipe and Base classes add images and drawing on top of the engine's state classes (see simulation.py), which 
+hold all of the game's physics.
+"""
 # Bird class representing the flappy bird
-class Bird:
-    MAX_ROTATION = 25  # Maximum tilt angle for the bird in degrees
-    IMGS = bird_images
-    ROT_VEL = 20 # Rotation velocity for the bird in degrees per frame
-    ANIMATION_TIME = 5 # Duration to display each bird animation frame, affecting wing flap speed
-
-    def __init__(self, x, y):
-        self.x = x # Bird's starting x position
-        self.y = y # Bird's starting y position
-        self.tilt = 0  # Initial tilt angle of the bird image, starting flat (0 degrees)
-        self.tick_count = 0
-        self.vel = 0
-        self.height = self.y
-        self.img_count = 0 # Counter to track the current bird image for animation
-        self.img = self.IMGS[0] # Initial image of the bird, referencing the first image in BIRD_IMGS (bird1.png)
-
-    # Make the bird jump
-    def jump(self):
-        """
-        Initial velocity of the bird, negative to move upwards in pygame coordinates where (0,0) is the top left of 
-        the screen.
-        """
-        self.vel = -10.5
-        self.tick_count = 0 # Keeps track of the time since the bird last jumped
-        self.height = self.y # Keeps track of the vertical position from which the bird last jumped
+class Bird(BirdState):
+    IMGS = None # The bird images bird1, bird2 and bird3, shown in sequence to create an animation effect
+    SPRITES = None # The rotated images of the bird, a SpriteCache built by init_display
 
-    # Make the bird move
-    def move(self):
-        self.tick_count += 1
-        """
-        displacement calculates how many pixels the bird moves up or down in each frame. The self.tick_count keeps 
-        track of the number of frames since the bird last jumped. When the bird changes direction or its velocity, 
-        self.tick_count increases accordingly. Initially, when the bird jumps, self.tick_count is reset to 0, and 
-        self.height is set to self.y (self.height = self.y), while the bird's velocity is set to -10.5 
-        (self.velocity = -10.5). For instance, when self.tick_count = 1, displacement is calculated as 
-        -10.5 * 1 + 0.5 * 3 * 1 ** 2 = -9. This means the bird moves 9 pixels upwards in this frame. In subsequent 
-        frames, the bird continues to move upwards less and less until displacement becomes 0. Then, the bird 
-        starts descending, moving positively again, resulting in an arc-like trajectory for its jump.
-        """
-        displacement = self.vel*(self.tick_count) + 0.5*(3)*(self.tick_count)**2  # calculate displacement
+    # The image for the bird's current animation frame
+    @property
+    def img(self):
+        return self.IMGS[self.frame]
 
-        """
-        Ensures the bird's velocity does not exceed a terminal velocity in either upward or downward motion
-        """
-        if displacement >= 16:
-            displacement = (displacement/abs(displacement)) * 16
-
-        if displacement < 0:
-            """
-            Adjusts the displacement when the bird is moving upwards, allowing it to ascend slightly more
-            """
-            displacement -= 2
-
-        self.y = self.y + displacement # Update the bird's vertical position based on the calculated displacement
-
-        """
-        # Adjusting the bird's tilt based on its vertical movement. If displacement is negative (indicating the bird is 
-        moving upwards) or if the bird's current y-position is above its jump height plus 50 pixels, tilt the bird 
-        upwards to simulate a flapping motion. Once the bird starts descending beyond its jump height, tilt it downwards.
-        """
-        if displacement < 0 or self.y < self.height + 50:  # tilt up
-            if self.tilt < self.MAX_ROTATION:
-                """
-                Rather than gradually tilting the bird upwards due to the limited MAX_ROTATION of 25 degrees, the tilt 
-                angle is immediately set to 25 degrees.
-                """
-                self.tilt = self.MAX_ROTATION
-        else: # If the bird is not moving upwards or we don't want it to tilt upwards, then tilt it downwards
-            """
-            If the bird is falling downward (displacement > 0), tilt it downwards up to 90 degrees. We do not limit 
-            the tilt to MAX_ROTATION because we want the bird to tilt more significantly when diving down, giving the 
-            appearance of a nose dive.
-            """
-            if self.tilt > -90:
-                self.tilt -= self.ROT_VEL # Decreases the bird's tilt angle to make it rotate downwards
+    # The tilted image of the bird and where to blit it. Looks the rotated image up in SPRITES instead of rotating
+    def sprite(self):
+        sprite, (dx, dy) = self.SPRITES.get(self.frame, self.tilt)
+        return sprite, (to_pixel(self.x) + dx, to_pixel(self.y) + dy)
 
     # Draw the bird onto the specified window (win)
     def draw(self, win):
-        self.img_count += 1 # Tracks how many times the current bird image has been displayed in the game loop ticks
+        win.blit(*self.sprite())
 
-        """
-        Determines which bird image to display based on img_count for animation. The animation cycles through three 
-        images (flapping wings) based on ANIMATION_TIME. When img_count reaches ANIMATION_TIME * 4 + 1, it resets to 
-        create smooth animation loops.
-        """
-        if self.img_count <= self.ANIMATION_TIME:
-            self.img = self.IMGS[0]
-        elif self.img_count <= self.ANIMATION_TIME*2:
-            self.img = self.IMGS[1]
-        elif self.img_count <= self.ANIMATION_TIME*3:
-            self.img = self.IMGS[2]
-        elif self.img_count <= self.ANIMATION_TIME*4:
-            self.img = self.IMGS[1]
-        elif self.img_count == self.ANIMATION_TIME*4 + 1:
-            self.img = self.IMGS[0]
-            self.img_count = 0
-
-        # When the bird tilts almost 90 degrees downwards, it stops flapping its wings to simulate a nose dive
-        if self.tilt <= -80:
-            self.img = self.IMGS[1] # Display the image where the wings are level
-            self.img_count = self.ANIMATION_TIME*2 # Reset img_count to continue the flapping animation smoothly
-
-        blitRotateCenter(win, self.img, (self.x, self.y), self.tilt) # Title the bird
-
-    # get_mask generates a collision mask for the current bird image to handle collisions in the game
+    # get_mask returns the precomputed collision mask of the current bird image
     def get_mask(self):
-        return pygame.mask.from_surface(self.img)
+        return collision_masks().bird[self.frame]
 
 #Represents a pipe object
-class Pipe():
-    GAP = 200 # GAP represents the vertical space between the upper and lower pipes
+class Pipe(PipeState):
     """
-    VEL represents the velocity at which the pipes move towards the bird, creating the illusion of the bird flying 
-    forward in Flappy Bird.
-    """
-    VEL = 5
-
-    """
-    The x parameter is used because the vertical positioning (height) of the pipes on the screen is randomly generated 
-    each time.
-    """
-    def __init__(self, x):
-        self.x = x
-        self.height = 0
-        """
-        Variables to track the top and bottom positions of the pipe for drawing. PIPE_TOP and PIPE_BOTTOM store the 
-        images for the top-facing and bottom-facing pipes respectively. PIPE_TOP is flipped vertically from the 
-        original pipe image (check imgs folder) to create the bottom-facing pipe image.
-        """
-        self.top = 0
-        self.bottom = 0
-        self.PIPE_TOP = pygame.transform.flip(pipe_img, False, True)
-        self.PIPE_BOTTOM = pipe_img
-        self.passed = False # Flag to indicate if the bird has already passed this pipe
-        self.set_height()
-    
+    PIPE_TOP and PIPE_BOTTOM store the images for the top-facing and bottom-facing pipes respectively. PIPE_TOP is 
+    flipped vertically from the original pipe image (check imgs folder) to create the bottom-facing pipe image. Both are 
+    shared by all pipes, so creating a pipe never touches an image. Both are set by init_display.
     """
-    Sets the height of the pipe and calculates positions for top and bottom pipes. The top pipe's height and position 
-    are randomly determined, creating a gap of GAP pixels between it and the bottom pipe.
-    """  
-    def set_height(self):
-        self.height = random.randrange(50, 450) # Determine a random height for the top of the pipe within a range
-        """
-        Calculate positions for the top and bottom of the pipe based on its height and gap.
-        """   
-        self.top = self.height - self.PIPE_TOP.get_height()
-        self.bottom = self.height + self.GAP
+    PIPE_TOP = None
+    PIPE_BOTTOM = None
 
-    """
-    Update the horizontal position of the pipe based on its velocity.
-    """
-    def move(self):
-        self.x -= self.VEL # Move the pipe to the left based on its velocity
+    # The images of the top and bottom pipes and their current positions, ready for Surface.blits
+    def sprites(self):
+        return [(self.PIPE_TOP, (self.x, self.top)), (self.PIPE_BOTTOM, (self.x, self.bottom))]
 
     # Draw both the top and bottom pipes at their current positions
     def draw(self, win):
-        win.blit(self.PIPE_TOP, (self.x, self.top))
-        win.blit(self.PIPE_BOTTOM, (self.x, self.bottom))
-
-    """
-    A mask represents an array of pixels inside a defined boundary. In the context of collision detection, it helps 
-    determine if two objects collide by checking the overlap of non-transparent pixels in their respective masks. Each 
-    image in the game has its own mask, which consists of rows and columns corresponding to the pixel layout of the 
-    image. By comparing these masks, the game can accurately detect pixel-perfect collisions between objects.
-    """
-    def collide(self, bird, win):
-        bird_mask = bird.get_mask()
-        # Creates masks for the top and bottom pipes for collision detection
-        top_mask = pygame.mask.from_surface(self.PIPE_TOP)
-        bottom_mask = pygame.mask.from_surface(self.PIPE_BOTTOM)
-        # Calculates offsets to determine pixel-perfect collision position between bird and pipes
-        top_offset = (self.x - bird.x, self.top - round(bird.y))
-        bottom_offset = (self.x - bird.x, self.bottom - round(bird.y))
-        # Determines collision points using offsets (bottom_offset and top_offset). Returns None if no collision occurs
-        b_point = bird_mask.overlap(bottom_mask, bottom_offset)
-        t_point = bird_mask.overlap(top_mask,top_offset)
-
-        """
-        Checks for collision based on overlap points between bird and pipes. Returns True if collision detected, 
-        False otherwise.
-        """
-        if b_point or t_point:
-            return True # Collision detected
-
-        return False # No collision detected
+        win.blits(self.sprites(), doreturn=False)
 
 # Represents the moving floor of the game
-class Base:
-    """
-    VEL represents the speed at which the pipes and other moving elements on the screen move horizontally. It should be 
-    synchronized with the speed of the pipes to maintain consistent movement across the screen.
-    """
-    VEL = 5
-    WIDTH = base_img.get_width() # WIDTH represents the width of a base image used in the game
-    IMG = base_img
-
-    """
-    Initializes a base object with a given y-coordinate.
+class Base(BaseState):
+    IMG = None # Set by init_display. The floor's width is BaseState.WIDTH, which does not depend on the image
 
-    Parameters:
-    y (int): The y-coordinate representing the vertical position of the base on the screen.
+    # The floor's two images, which move together, and their positions
+    def sprites(self):
+        return [(self.IMG, (self.x1, self.y)), (self.IMG, (self.x2, self.y))]
 
-    Note:
-    Since the base moves horizontally to the left, the x-coordinate is managed dynamically
-    and does not need to be explicitly defined in the constructor.
-    """
-    def __init__(self, y):
-        self.y = y
-        self.x1 = 0 # x-coordinate of the first base image, positioned at the start of the screen
-        self.x2 = self.WIDTH # x-coordinate of the second base image, positioned directly behind the first base
-
-    # Move floor so it looks like its scrolling
-    def move(self):
-        # Move both base images horizontally with the same velocity (VEL)
-        self.x1 -= self.VEL
-        self.x2 -= self.VEL
-
-        # Check if either base image has moved completely off-screen, then cycle it to the back
-        if self.x1 + self.WIDTH < 0:
-            self.x1 = self.x2 + self.WIDTH # Move self.x1 to the position just behind self.x2
-
-        if self.x2 + self.WIDTH < 0:
-            self.x2 = self.x1 + self.WIDTH # Move self.x2 to the position just behind self.x1
-
-    # Draw the floor, this is two images that move together
+    # Draw the floor
     def draw(self, win):
-        win.blit(self.IMG, (self.x1, self.y))
-        win.blit(self.IMG, (self.x2, self.y))
+        win.blits(self.sprites(), doreturn=False)
+
 
+"""
+Every tilt a bird can have. Birds start level, tilt up to MAX_ROTATION whenever they rise and tilt down by ROT_VEL per 
+frame while their tilt is above -90 degrees, so the tilt only ever takes a few values.
+"""
+def bird_tilts():
+    tilts = set()
+    for tilt in (0, Bird.MAX_ROTATION):
+        tilts.add(tilt)
+        while tilt > -90:
+            tilt -= Bird.ROT_VEL
+            tilts.add(tilt)
+    return sorted(tilts)
 
-def blitRotateCenter(surf, image, topleft, angle):
+"""
+The rotated images of a sprite, keyed by animation frame and tilt (rounded to whole degrees). Each entry holds the 
+rotated surface and its offset from the unrotated image's top left corner, so blitting it there rotates the sprite 
+around its center. The given tilts are rotated up front, any other tilt the first time it is drawn.
+"""
+class SpriteCache:
+    def __init__(self, images, tilts=()):
+        self.images = images
+        self.sprites = {}
+        for frame in range(len(images)):
+            for tilt in tilts:
+                self.get(frame, tilt)
+
+    # Returns the (surface, offset) pair for the given animation frame and tilt
+    def get(self, frame, tilt):
+        key = (frame, round(tilt))
+        sprite = self.sprites.get(key)
+        if sprite is None:
+            image = self.images[frame]
+            rotated_image = pygame.transform.rotate(image, key[1])
+            sprite = self.sprites[key] = (rotated_image, rotated_image.get_rect(center=image.get_rect().center).topleft)
+        return sprite
+
+# Rounds a coordinate to a whole pixel the way pygame.Rect does, with halves rounded away from zero
+def to_pixel(v):
+    return int(v + 0.5) if v >= 0 else int(v - 0.5)
+
+def init_display():
     """
-    Rotates an image and blits it onto a surface at a specified angle around its center.
-    Args:
-    - surf: The surface (window) onto which the rotated image will be drawn.
-    - image: The image surface that you want to rotate and draw.
-    - topleft: Tuple (x, y) specifying the top-left corner coordinates where the rotated image will be positioned.
-    - angle: The angle in degrees by which you want to rotate the image.
+    Opens the game window the first time a generation is drawn, loads the images and fonts and converts the images for 
+    fast blitting. Collision masks are identical for converted and unconverted images, so headless and rendered 
+    generations play the same game.
     """
-    # Rotate the original image by the specified angle
-    rotated_image = pygame.transform.rotate(image, angle)
-    # Align the center of the rotated image with the original image's center
-    new_rect = rotated_image.get_rect(center = image.get_rect(topleft = topleft).center)
-     # Blit (draw) the rotated image onto the surface ('surf') at the calculated position
-    surf.blit(rotated_image, new_rect.topleft)
+    global WIN, bg_img, STAT_FONT, END_FONT
+    if WIN is None:
+        WIN = pygame.display.set_mode((WIN_WIDTH, WIN_HEIGHT))
+        pygame.display.set_caption("Flappy Bird")
+        for name in IMAGES:
+            assets.image(name)
+        assets.convert() # The background is fully opaque, so it is converted without alpha
+        bg_img = assets.image("bg")
+        pipe_img = assets.image("pipe")
+        Pipe.PIPE_TOP = pygame.transform.flip(pipe_img, False, True)
+        Pipe.PIPE_BOTTOM = pipe_img
+        Base.IMG = assets.image("base")
+        Bird.IMGS = [assets.image("bird" + str(x)) for x in range(1, 4)]
+        Bird.SPRITES = SpriteCache(Bird.IMGS, bird_tilts())
+        STAT_FONT = assets.font(50)
+        END_FONT = assets.font(70)
+    return WIN
 
-# Draws the window for the main game loop
-def draw_window(win, birds, pipes, base, score, gen, pipe_ind):
-    # Ensure generation number starts from 1 for display purposes
-    if gen == 0:
-        gen = 1
+"""
+The limits of a generation: max_frames, max_score and max_fitness, the fitness at which to stop, or None for no limit. 
+They are worked out in the main process and handed to the workers of parallel runs along with the genomes.
+"""
+Limits = namedtuple("Limits", ["max_frames", "max_score", "max_fitness"])
+
+def generation_limits(config):
+    max_fitness = None
+    if STOP_AT_THRESHOLD and config.fitness_criterion == "max" and not config.no_fitness_termination:
+        max_fitness = config.fitness_threshold
+    return Limits(MAX_FRAMES, MAX_SCORE, max_fitness)
 
-    # Draw the background image on the game window
-    win.blit(bg_img, (0,0))
+# True once the game has lasted max_frames frames or max_score pipes
+def out_of_time(sim, limits):
+    return ((limits.max_frames is not None and sim.frames >= limits.max_frames) or
+            (limits.max_score is not None and sim.score >= limits.max_score))
 
-    # Draw all pipes on the game window
-    for pipe in pipes:
-        pipe.draw(win)
+"""
+True if the networks of config take the EXTENDED_INPUTS (see simulation.py) rather than the BASIC_INPUTS, going by the 
+config's num_inputs: config_feedforward.txt has num_inputs = 3, a config with num_inputs = 5 trains on the extended 
+inputs.
+"""
+def extended_inputs(config):
+    num_inputs = config.genome_config.num_inputs
+    if num_inputs not in (len(BASIC_INPUTS), len(EXTENDED_INPUTS)):
+        raise ValueError("num_inputs must be {0} ({1}) or {2} ({3}), not {4}".format(
+            len(BASIC_INPUTS), ", ".join(BASIC_INPUTS), len(EXTENDED_INPUTS), ", ".join(EXTENDED_INPUTS), num_inputs))
+    return num_inputs == len(EXTENDED_INPUTS)
 
-    # Draw the base (ground) on the game window
-    base.draw(win)
+# Returns True if the given generation should be drawn, based on RENDER_EVERY
+def should_render(gen):
+    return RENDER_EVERY > 0 and (gen - 1) % RENDER_EVERY == 0
+
+"""
+Draws the game window without repainting all of it every frame. Everything is drawn with batched Surface.blits calls, 
+the labels are only rendered again when their text changes, and only the dirty rectangles (the areas drawn on this 
+frame or the previous one) are repainted with the background and sent to the display. The first frame of every 
+generation repaints and updates the whole window.
+"""
+class Renderer:
+    def __init__(self):
+        self.gen = None # Generation of the last frame drawn, a new generation starts with a full repaint
+        self.dirty = [] # Areas drawn on the last frame, which have to be repainted with the background on the next one
+        self.labels = {} # Label name -> (text, surface)
+
+    # Returns the surface of a label, rendering it only if its text changed since the last frame
+    def label(self, name, text):
+        cached = self.labels.get(name)
+        if cached is None or cached[0] != text:
+            cached = self.labels[name] = (text, STAT_FONT.render(text, 1, (255,255,255)))
+        return cached[1]
+
+    def draw(self, win, birds, pipes, base, score, gen, pipe_ind):
+        full = gen != self.gen or DRAW_LINES # The debug lines are not tracked, so they need full repaints
+        self.gen = gen
+
+        # Paint the background image over the whole window, or only over the areas drawn on the last frame
+        if full:
+            win.blit(bg_img, (0,0))
+        else:
+            win.blits([(bg_img, rect, rect) for rect in self.dirty], doreturn=False)
+
+        # Draw all pipes and the base (ground) in one batch
+        scenery = []
+        for pipe in pipes:
+            scenery.extend(pipe.sprites())
+        scenery.extend(base.sprites())
+        dirty = win.blits(scenery)
 
-    # Draw each bird on the game window
-    for bird in birds:
         # Optionally draw lines from birds to pipes (for debugging or visualizing)
-        if DRAW_LINES:
-            try:
-                 # Draw a line from bird center to top pipe center
+        if DRAW_LINES and pipe_ind < len(pipes):
+            for bird in birds:
+                # Draw a line from bird center to top pipe center
                 pygame.draw.line(win, (255,0,0), (bird.x+bird.img.get_width()/2, bird.y + bird.img.get_height()/2), 
                             (pipes[pipe_ind].x + pipes[pipe_ind].PIPE_TOP.get_width()/2, pipes[pipe_ind].height), 5)
                 # Draw a line from bird center to bottom pipe center
                 pygame.draw.line(win, (255,0,0), (bird.x+bird.img.get_width()/2, bird.y + bird.img.get_height()/2), 
                             (pipes[pipe_ind].x + pipes[pipe_ind].PIPE_BOTTOM.get_width()/2, pipes[pipe_ind].bottom), 5)
-            except:
-                pass
-        # Draw each bird's image on the game window
-        bird.draw(win)
 
-    # Render and display the current score on the game window
-    score_label = STAT_FONT.render("Score: " + str(score),1,(255,255,255))
-    win.blit(score_label, (WIN_WIDTH - score_label.get_width() - 15, 10))
+        # Draw each bird's image, all in one batch. The birds all fly in the same column, so one rectangle covers them
+        bird_rects = win.blits([bird.sprite() for bird in birds])
+        if bird_rects:
+            dirty.append(bird_rects[0].unionall(bird_rects[1:]))
 
-    # Render and display the current generation number on the game window
-    gen_label = STAT_FONT.render("Gens: " + str(gen-1),1,(255,255,255))
-    win.blit(gen_label, (10, 10))
+        # Draw the score, the generation number and the number of alive birds
+        score_label = self.label("score", "Score: " + str(score))
+        gen_label = self.label("gen", "Gens: " + str(gen-1))
+        alive_label = self.label("alive", "Alive: " + str(len(birds)))
+        dirty.extend(win.blits([(score_label, (WIN_WIDTH - score_label.get_width() - 15, 10)), 
+                                (gen_label, (10, 10)), (alive_label, (10, 50))]))
 
-    # Render and display the number of alive birds on the game window
-    alive_label = STAT_FONT.render("Alive: " + str(len(birds)),1,(255,255,255))
-    win.blit(alive_label, (10, 50))
+        """
+        Update the display to show all changes made to the game window: the areas of the last frame, which were 
+        repainted, and the areas drawn on this one.
+        """
+        if full:
+            pygame.display.update()
+        else:
+            pygame.display.update(self.dirty + dirty)
+        self.dirty = dirty
 
-    # Update the display to show all changes made to the game window
-    pygame.display.update()
+renderer = Renderer()
+
+# Draws the window for the main game loop
+def draw_window(win, birds, pipes, base, score, gen, pipe_ind):
+    # Ensure generation number starts from 1 for display purposes
+    if gen == 0:
+        gen = 1
+    renderer.draw(win, birds, pipes, base, score, gen, pipe_ind)
+
+"""
+The fitness of the birds of a game, as NumPy arrays, so the rewards of a frame cost a few array operations instead of 
+a pass over the genomes. fitness holds the fitness of the birds still flying, in the order of sim.birds, and is 
+filtered with the same alive flags as the simulation; a bird's fitness is moved to final, which covers every bird the 
+game started with, when it dies. With several worlds, the birds are world-major like MultiWorldSimulation's, and a 
+genome's fitness is the mean over the worlds of its birds' fitness.
+
+The rules are the same for every game (+0.1 per frame alive, -1 for hitting a pipe, +5 per pipe passed for every bird 
+that did not hit it, birds hitting the floor in that frame included), and every bird's rewards are added in the same 
+order whichever game it flies in, so a genome gets exactly the same fitness in eval_genomes as on its own.
+"""
+class GenerationFitness:
+    def __init__(self, genomes, worlds=1):
+        self.genomes = genomes
+        self.worlds = worlds
+        self.fitness = np.zeros(genomes * worlds)
+        self.birds = np.arange(genomes * worlds) # The index of every bird still flying among the birds of the game
+        self.final = np.zeros(genomes * worlds)
+
+    # Rewards every bird still flying for surviving up to this frame
+    def survive(self):
+        self.fitness += 0.1
+
+    # Rewards the birds of the frame whose StepResult is result, before the dead birds are dropped
+    def reward(self, result):
+        if result.crashed:
+            self.fitness[result.crashed] -= 1
+        if result.passed:
+            survived = np.ones(len(self.fitness), dtype=bool)
+            survived[result.crashed] = False
+            self.fitness[survived] += 5
+
+    # Drops the birds that died in the frame, keeping their fitness
+    def keep(self, alive):
+        alive = np.asarray(alive, dtype=bool)
+        self.final[self.birds[~alive]] = self.fitness[~alive]
+        self.fitness = self.fitness[alive]
+        self.birds = self.birds[alive]
+
+    # The fitness of every genome: the mean over the worlds of the fitness of its birds, dead or alive
+    def means(self):
+        fitness = self.final.copy()
+        fitness[self.birds] = self.fitness
+        total = np.zeros(self.genomes)
+        for world in fitness.reshape(self.worlds, self.genomes): # Summed in world order, whatever the game
+            total += world
+        return total / self.worlds if self.worlds > 1 else total
+
+    """
+    The best fitness of the game so far, to check against the fitness threshold. On a single course only the birds 
+    still flying (and those that died in this frame) need looking at, as they all have the same fitness, which no dead 
+    bird ever had more of.
+    """
+    def best(self):
+        if self.worlds == 1:
+            return self.fitness.max()
+        return self.means().max()
 
 """
 Runs the simulation of the current population of birds and sets their fitness based on the distance they reach in the 
 game.
 """
 def eval_genomes(genomes, config):
-    global WIN, gen
-    win = WIN
+    global gen
     gen += 1
+    render = should_render(gen)
+    win = init_display() if render else None
     """
-    List to keep track of the neural network controlling each bird in the population.Each element corresponds to the 
-    neural network associated with a bird's behavior and position on the screen.
+    The birds live in the simulation, which is created with one bird per genome (per course, see below). Drawn 
+    generations use the Bird, Pipe and Base renderers, headless generations use the engine's plain state classes, with 
+    all birds stepped at once as arrays if BATCHED. nets (the compiled neural networks controlling the birds, see 
+    network.py), fitness (see GenerationFitness) and sim.birds are synchronized such that each position in them 
+    corresponds to the same bird, and are filtered together when birds die. The genomes only get their fitness at the 
+    end of the generation.
     """
-    nets = []
-    birds = []
+    population = [genome for genome_id, genome in genomes]
+
     """
-    List to keep track of genomes associated with each bird in the population. Each element corresponds to the genome 
-    of a specific bird, allowing users to modify bird fitness based on its performance, such as distance traveled or 
-    collisions with pipes. The three lists (nets, ge, and birds) are synchronized such that each position in these 
-    lists corresponds to the same bird:
-    - Position 0 in `ge` corresponds to the genome of bird 0.
-    - Position 0 in `nets` corresponds to the neural network controlling bird 0.
-    - Position 0 in `birds` corresponds to the bird object representing bird 0.
-    This organization allows for coordinated management of bird genomes, neural networks, and bird objects.
+    Compiles the feedforward neural networks of all genomes into arrays, so the whole population is evaluated with a 
+    single call per frame. Every game in this module and in replay.py uses these networks, so a genome's outputs, and 
+    its fitness, never depend on how it is evaluated (see network.py for how they compare with neat's own networks).
     """
-    ge = []
-    
+    nets = BatchedNetworks.create(population, config)
+    extended = extended_inputs(config)
+
     """
-    This for loop iterates over genomes and sets up a neural network and a bird object for each genome.
+    All birds of a generation fly the same course, a pipe schedule generated once per generation from a seed drawn from 
+    the global random module (which SEED seeds). eval_genome plays a single genome on a given schedule, and gets exactly 
+    the same fitness as the genome's bird gets here.
+
+    With WORLDS above 1, WORLDS courses are generated and headless generations fly every genome on all of them at once 
+    (see MultiWorldSimulation): nets holds one copy of every genome's network per course, in the order of the 
+    simulation's birds, and a genome's fitness is the mean of its birds' fitness over the courses. Drawn generations 
+    only fly the first course.
     """
-    for genome_id, genome in genomes:
-        genome.fitness = 0  # start with fitness level of 0
-        """
-        Creates a feedforward neural network (net) using the provided genome and configuration.
-        """
-        net = neat.nn.FeedForwardNetwork.create(genome, config)
-        nets.append(net)
-        birds.append(Bird(230,350))
-        """
-        Appends the given genome object to the ge list. This operation ensures that the genome, representing genetic 
-        information for a bird controlled by a neural network created in NEAT, is stored alongside its corresponding 
-        neural network and other relevant data. This allows for detailed tracking of each bird's genetic makeup and 
-        fitness evaluation throughout the evolutionary process.
-        """
-        ge.append(genome)
-
-    base = Base(FLOOR)
-    pipes = [Pipe(700)]
-    score = 0
+    schedules = [PipeSchedule(random.randrange(2**32)) for _ in range(WORLDS)]
+    timer = frame_timer if PROFILE else NULL_TIMER # Collects the time spent in each phase of every frame
+    if render:
+        sim = Simulation(len(population), Bird, Pipe, Base, schedule=schedules[0], timer=timer)
+    elif WORLDS > 1:
+        sim = MultiWorldSimulation(len(population), schedules, timer=timer)
+        nets = BatchedNetworks(nets.networks * WORLDS)
+    elif BATCHED:
+        sim = BatchedSimulation(len(population), schedule=schedules[0], timer=timer)
+    else:
+        sim = Simulation(len(population), schedule=schedules[0], timer=timer)
+    fitness = GenerationFitness(len(population), WORLDS if isinstance(sim, MultiWorldSimulation) else 1)
+    birds = sim.birds
     clock = pygame.time.Clock() # Creates a pygame Clock object to control the frame rate of the game loop
+    actions = None # No bird has decided to jump before the first frame
     run = True
 
-    while run and len(birds) > 0:
-        clock.tick(30) # Limits the maximum frame rate to 30 frames per second (fps).
+    # The generation ends when every bird is dead or a limit is hit
+    limits = generation_limits(config)
+    while run and len(birds) > 0 and not out_of_time(sim, limits):
+        if render and FPS:
+            clock.tick(FPS) # Limits the maximum frame rate of drawn generations (30 frames per second by default)
 
-        # Process events from the Pygame event queue to handle user inputs such as mouse clicks or window closure
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                run = False
-                pygame.quit()
-                quit()
-                break
+        """
+        Process events from the Pygame event queue to handle user inputs such as mouse clicks or window closure. 
+        Headless generations skip this entirely; if a window is open from an earlier drawn generation, the queue is 
+        only checked every EVENT_INTERVAL frames so the window stays responsive.
+        """
+        if render or (WIN is not None and sim.frames % EVENT_INTERVAL == 0):
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT:
+                    run = False
+                    pygame.quit()
+                    quit()
+                    break
 
         """
-        Determine which pipe the bird should consider for its neural network input based on its position relative to 
-        the pipes.
+        Adjusting the fitness of the birds: incrementing each bird's fitness score slightly for its survival up to this 
+        point. This encourages the bird to continue progressing forward. The fitness is incremented by 0.1 to reward the 
+        bird for each frame it remains active. This increment rate is designed to provide incentive for the bird to 
+        maintain its position without flying excessively high or low, given that this loop runs 30 times per second 
+        (`clock.tick(30)`) in drawn generations.
         """
-        pipe_ind = 0 # Initialize pipe index to 0 for the input to the neural network
-        if len(birds) > 0:
-            # Update the pipe index that the bird should consider for its neural network input.
-            if len(pipes) > 1 and birds[0].x > pipes[0].x + pipes[0].PIPE_TOP.get_width():  
-                pipe_ind = 1
+        fitness.survive()
+
+        timer.start() # Only the step and the network updates are timed, not the fitness bookkeeping around them
+        result = sim.step(actions) # Jump, move the birds, pipes and floor, and check for collisions
 
         """
-        This loop iterates through each bird in the `birds` list, passing specific inputs to its associated neural 
-        network, receiving an output value, and triggering a jump if the output value is greater than 0.5.
+        Every time a bird hits a pipe, its fitness score will decrease by 1. This ensures there is no bias towards birds 
+        that cover more distance but frequently collide with pipes. By deducting fitness on collision, a bird that 
+        avoids hitting pipes will have a higher fitness score compared to a bird that collides with pipes. This 
+        encourages birds to navigate between the pipes effectively. The fitness of each bird increases by 5 if a bird 
+        passes through a pipe. Birds that hit the floor in the same frame still get the bonus, only birds that crashed 
+        into the pipe miss out.
         """
-        for x, bird in enumerate(birds):
-            """
-            Adjusting the fitness of the bird: incrementing the bird's fitness score slightly for its survival up to 
-            this point. This encourages the bird to continue progressing forward. The fitness is incremented by 0.1 to 
-            reward the bird for each frame it remains active. This increment rate is designed to provide incentive for 
-            the bird to maintain its position without flying excessively high or low, given that this loop runs 30 
-            times per second (`clock.tick(30)`).
-            """
-            ge[x].fitness += 0.1
-            bird.move()
-            """
-            Activating the neural network with specific inputs:
-            - `bird.y`: Current y-coordinate of the bird.
-            - `abs(bird.y - pipes[pipe_ind].height)`: Vertical distance between the bird and the top of the selected 
-            pipe.
-            - `abs(bird.y - pipes[pipe_ind].bottom)`: Vertical distance between the bird and the bottom of the selected 
-            pipe.
-            """
-            output = nets[birds.index(bird)].activate((bird.y, abs(bird.y - pipes[pipe_ind].height), 
-                                                       abs(bird.y - pipes[pipe_ind].bottom)))
-
-            if output[0] > 0.5:  # we use a tanh activation function so result will be between -1 and 1. if over 0.5 jump
-                bird.jump()
-
-        base.move()
+        fitness.reward(result)
+
+        # Stop as soon as a genome reaches the fitness limit, counting the birds that died in this frame
+        if limits.max_fitness is not None and fitness.best() >= limits.max_fitness:
+            break
+
         """
-        Check the x position of each pipe. If a pipe moves off-screen (i.e., its x position is less than 0), mark it 
-        for removal from the list.
+        Remove the neural networks and fitness of the birds that crashed or fell. The simulation already dropped their 
+        birds, and filtering nets and fitness with the same alive flags keeps all three in sync.
         """
-        rem = []
-        add_pipe = False
-
-        for pipe in pipes: # Move each pipe horizontally across the screen by a fixed velocity
-            pipe.move()
-
-            for bird in birds: # Check collision of each bird with each pipe in the game
-                if pipe.collide(bird, win):
-                    """
-                    Every time a bird hits a pipe, its fitness score will decrease by 1. This ensures there is no bias 
-                    towards birds that cover more distance but frequently collide with pipes. By deducting fitness on 
-                    collision, a bird that avoids hitting pipes will have a higher fitness score compared to a bird 
-                    that collides with pipes. This encourages birds to navigate between the pipes effectively.
-                    """
-                    ge[birds.index(bird)].fitness -= 1
-                    nets.pop(birds.index(bird)) # Remove the neural network associated with the bird 
-                    ge.pop(birds.index(bird)) # Remove the genome associated with the bird
-                    birds.pop(birds.index(bird)) # Remove the bird object from the list
-
-            """
-            This if statement checks if the bird has passed the pipe. If the bird's x-coordinate is greater than the
-            pipe's x-coordinate (indicating that the bird has flown past the pipe), and if the pipe hasn't been 
-            marked as passed yet (`pipe.passed` is False), then the pipe is marked as passed (`pipe.passed = True`). 
-            This triggers the addition of a new pipe to the game.
-            """
-            if pipe.x + pipe.PIPE_TOP.get_width() < 0:
-                rem.append(pipe)
-
-            """
-            This if statement checks if the bird has passed the pipe. As soon as the bird passes a pipe, a new pipe
-            is generated.
-            """
-            if not pipe.passed and pipe.x < bird.x:
-                pipe.passed = True
-                add_pipe = True
-
-        if add_pipe:
-            score += 1 # Increment the score by 1 each time a bird successfully passes a pipe 
-
-            for genome in ge: # Increase the fitness of each genome by 5 if a bird passes through a pipe
-                genome.fitness += 5
-            """
-            Add a new Pipe object to the pipes list, spawning it at the specified x position (WIN_WIDTH).
-            """
-            pipes.append(Pipe(WIN_WIDTH))
-
-        for r in rem: # Remove pipes from the pipes list that have gone off the screen, based on the rem list
-            pipes.remove(r)
+        timer.start()
+        if result.crashed or result.fell:
+            fitness.keep(result.alive)
+            nets = nets.keep(result.alive)
+        birds = sim.birds
 
         """
-        Iterate through each bird in the birds list to check if it has hit the ground. If a bird's y-coordinate plus 
-        its image height minus 10 is greater than or equal to FLOOR (730) or if its y-coordinate is less than -50, 
-        remove that bird from the list.
+        Each bird's inputs are passed to its associated neural network, all in one call, receiving an output value, 
+        and the bird jumps on the next frame if the output value is greater than 0.5. The inputs are:
+        - `bird.y`: Current y-coordinate of the bird.
+        - `abs(bird.y - pipe.height)`: Vertical distance between the bird and the top of the selected pipe.
+        - `abs(bird.y - pipe.bottom)`: Vertical distance between the bird and the bottom of the selected pipe.
+        With num_inputs = 5 in the config, the bird's vertical velocity and its horizontal distance to the selected pipe 
+        follow (see extended_inputs).
         """
-        for bird in birds:
-            if bird.y + bird.img.get_height() - 10 >= FLOOR or bird.y < -50:
-                nets.pop(birds.index(bird))
-                ge.pop(birds.index(bird))
-                birds.pop(birds.index(bird))
+        # we use a tanh activation function so result will be between -1 and 1. if over 0.5 jump
+        if len(birds) > 0:
+            actions = nets.activate(sim.observe(extended))[:, 0] > 0.5
+        timer.lap("inference")
+
+        if render:
+            draw_window(win, birds, sim.pipes, sim.base, sim.score, gen, sim.pipe_ind)
+            timer.lap("rendering")
+        timer.end_frame()
+
+    for genome, genome_fitness in zip(population, fitness.means()):
+        genome.fitness = float(genome_fitness)
+    generation_stats.record(sim.frames, sim.score)
+
+"""
+Plays a single genome on its own, headless and uncapped, and returns its fitness, the number of frames its game lasted 
+and the number of pipes it passed. The rules are the same as in eval_genomes (+0.1 per frame alive, +5 per pipe 
+passed, -1 for hitting a pipe), and since a bird's game does not depend on the other birds, a genome flying the course 
+of the given PipeSchedule scores exactly what it would in a shared generation. Genomes can be spread over all CPU cores 
+this way (see SeededParallelEvaluator).
+
+The game ends early at the given Limits (see generation_limits), and every genome stops on its own, so a worker never 
+waits on a genome that flies forever. On a single course, all birds still alive in a frame have the same fitness, so 
+genomes stop with the fitness they would have when eval_genomes stops the whole generation.
+"""
+def play_genome(genome, config, schedule=None, limits=None):
+    limits = limits or generation_limits(config)
+    nets = BatchedNetworks.create([genome], config) # The networks eval_genomes uses, so the outputs match bit for bit
+    extended = extended_inputs(config)
+    sim = Simulation(1, schedule=schedule)
+    fitness = GenerationFitness(1)
+    actions = None
+
+    while len(sim.birds) > 0 and not out_of_time(sim, limits):
+        fitness.survive()
+        result = sim.step(actions)
+        fitness.reward(result)
+        if limits.max_fitness is not None and fitness.best() >= limits.max_fitness:
+            break
+
+        if result.crashed or result.fell:
+            fitness.keep(result.alive)
+        if len(sim.birds) > 0:
+            actions = nets.activate(sim.observe(extended))[:, 0] > 0.5
+
+    return float(fitness.means()[0]), sim.frames, sim.score
+
+# play_genome returning the fitness only, which is the signature neat.ParallelEvaluator expects
+def eval_genome(genome, config, schedule=None, limits=None):
+    return play_genome(genome, config, schedule, limits)[0]
+
+"""
+play_genome for WORLDS above 1: plays a single genome on every schedule in schedules at once, and returns its mean 
+fitness, the number of frames the simulation of all courses lasted and the most pipes passed on one of them. The 
+fitness is kept like in eval_genomes (see GenerationFitness), so it is exactly the one eval_genomes gives the genome, 
+unless the generation stops early. It stops at the given Limits like play_genome.
+"""
+def play_genome_worlds(genome, config, schedules, limits=None):
+    limits = limits or generation_limits(config)
+    nets = BatchedNetworks([CompiledNetwork.create(genome, config)] * len(schedules))
+    extended = extended_inputs(config)
+    sim = MultiWorldSimulation(1, schedules)
+    fitness = GenerationFitness(1, len(schedules))
+    actions = None
+
+    while len(sim.birds) > 0 and not out_of_time(sim, limits):
+        fitness.survive()
+        result = sim.step(actions)
+        fitness.reward(result)
+        if limits.max_fitness is not None and fitness.best() >= limits.max_fitness:
+            break
+
+        if result.crashed or result.fell:
+            fitness.keep(result.alive)
+            nets = nets.keep(result.alive)
+        if len(sim.birds) > 0:
+            actions = nets.activate(sim.observe(extended))[:, 0] > 0.5
+
+    return float(fitness.means()[0]), sim.frames, sim.score
+
+# play_genome_worlds returning the fitness only, like eval_genome
+def eval_genome_worlds(genome, config, schedules, limits=None):
+    return play_genome_worlds(genome, config, schedules, limits)[0]
 
-        draw_window(WIN, birds, pipes, base, score, gen, pipe_ind)
+"""
+A neat.ParallelEvaluator that generates the pipe schedules of every generation exactly like eval_genomes does, and 
+hands them to every worker, so all genomes of a generation fly the same courses in whichever process they are 
+evaluated. With worlds above 1, eval_function gets the list of schedules instead of a single one (see 
+play_genome_worlds).
+
+Unlike neat.ParallelEvaluator's, eval_function returns the frames and pipes of the genome's game along with its 
+fitness, like play_genome, so the games of the workers are recorded in generation_stats too.
+"""
+class SeededParallelEvaluator(neat.ParallelEvaluator):
+    def __init__(self, num_workers, eval_function, timeout=None, worlds=1):
+        super().__init__(num_workers, eval_function, timeout)
+        self.worlds = worlds
+
+    def evaluate(self, genomes, config):
+        schedules = [PipeSchedule(random.randrange(2**32)) for _ in range(self.worlds)]
+        courses = schedules if self.worlds > 1 else schedules[0]
+        limits = generation_limits(config)
+        jobs = []
+        for genome_id, genome in genomes:
+            jobs.append(self.pool.apply_async(self.eval_function, (genome, config, courses, limits)))
+
+        # assign the fitness back to each genome
+        for job, (genome_id, genome) in zip(jobs, genomes):
+            genome.fitness, frames, pipes = job.get(timeout=self.timeout)
+            generation_stats.record(frames, pipes)
 
 # Runs the NEAT algorithm to train a neural network to play flappy bird
-def run(config_file):
-    # Load configuration settings from the provided config file path
-    config = neat.config.Config(neat.DefaultGenome, neat.DefaultReproduction,
-                         neat.DefaultSpeciesSet, neat.DefaultStagnation,
-                         config_file)
-    p = neat.Population(config) # Initialize a NEAT population using the loaded configuration settings
+def run(config_file, workers=WORKERS, seed=SEED, resume=None, reporters=(), pop_size=None):
+    global gen
+    if resume is not None:
+        """
+        Pick up from a checkpoint, with the population, species, best genome and random state it was saved with. 
+        The checkpoint's config is used, and the generations it had finished are not evaluated again.
+        """
+        p = Checkpointer.restore_checkpoint(resume)
+        config = p.config
+        gen = p.generation
+        if pop_size is not None: # Only the generations bred from now on have the new size
+            config.pop_size = pop_size
+    else:
+        """
+        Seeding the global random module fixes both NEAT's mutations and the seeds of the generations' courses, so 
+        the same seed and config replay the same run with bit-identical fitness scores, whatever the number of workers.
+        """
+        if seed is not None:
+            random.seed(seed)
+
+        # Load configuration settings from the provided config file path
+        config = neat.config.Config(neat.DefaultGenome, neat.DefaultReproduction,
+                             neat.DefaultSpeciesSet, neat.DefaultStagnation,
+                             config_file)
+        if pop_size is not None: # Overrides the config's pop_size
+            config.pop_size = pop_size
+        p = neat.Population(config) # Initialize a NEAT population using the loaded configuration settings
     """
-    Add reporters to the NEAT population to provide detailed statistics about each generation in the console.
+    Add reporters to the NEAT population to provide detailed statistics about each generation in the console, and to 
+    save the training progress to disk.
     """
     p.add_reporter(neat.StdOutReporter(True))
     stats = neat.StatisticsReporter()
     p.add_reporter(stats)
+    if PROFILE:
+        p.add_reporter(ProfileReporter(frame_timer))
+    if TELEMETRY_FILE:
+        p.add_reporter(TelemetryReporter(TELEMETRY_FILE))
+    if CHECKPOINT_EVERY > 0:
+        p.add_reporter(Checkpointer(CHECKPOINT_EVERY, filename_prefix=CHECKPOINT_PREFIX, best_genome=p.best_genome))
+    p.add_reporter(BestGenomeSaver(BEST_GENOME_FILE, best_genome=p.best_genome))
+    for reporter in reporters: # Any extra reporters the caller wants, e.g. the benchmark's generation timer
+        p.add_reporter(reporter)
     """
     The bird's fitness is determined by how far it moves in the game. The main function acts as the fitness function for 
-    the NEAT algorithm. It will be called 50 times, passing all genomes and the config file each time.
+    the NEAT algorithm. It will be called once per generation until GENERATIONS have run, passing all genomes and the 
+    config file each time.
     """
-    winner = p.run(eval_genomes, 50) # 50 specifies the number of generations to run
+    generations = GENERATIONS - p.generation
+    if generations <= 0:
+        winner = p.best_genome # The checkpoint was saved after the last generation, there is nothing left to run
+    elif workers > 1:
+        """
+        Spread the genomes over worker processes. Workers never draw anything, so they do not need a display.
+        """
+        if WORLDS > 1:
+            evaluator = SeededParallelEvaluator(workers, play_genome_worlds, worlds=WORLDS)
+        else:
+            evaluator = SeededParallelEvaluator(workers, play_genome)
+        winner = p.run(evaluator.evaluate, generations)
+    else:
+        winner = p.run(eval_genomes, generations)
 
     # show final stats
     print('\nBest genome:\n{!s}'.format(winner))
+    if collision_stats.pairs: # Worker processes keep their own counts, so there is nothing to show for parallel runs
+        print('\nCollision checks: {!s}'.format(collision_stats))
 
 
+# argparse types of the options taking a count, which must be at least minimum (also used by replay.py and benchmark.py)
+def count(minimum):
+    def parse(text):
+        value = int(text)
+        if value < minimum:
+            raise argparse.ArgumentTypeError("must be at least {0}, got {1}".format(minimum, value))
+        return value
+    return parse
+
 if __name__ == '__main__':
-    local_dir = os.path.dirname(__file__) # Get the directory containing the script
-    config_path = os.path.join(local_dir, 'Config_Feedforward.txt') # Construct the absolute path to the config file
-    run(config_path)
+    """
+    The command line overrides the settings at the top of this file, so runs can be scripted without editing it. Every 
+    option defaults to the setting it replaces.
+    """
+    local_dir = os.path.dirname(os.path.abspath(__file__)) # Get the directory containing the script
+    parser = argparse.ArgumentParser(description="Train a NEAT population to play flappy bird.")
+    parser.add_argument("--config", default=os.path.join(local_dir, "config_feedforward.txt"),
+                        help="NEAT config file (default: config_feedforward.txt next to this script)")
+    parser.add_argument("--generations", type=count(1), default=GENERATIONS,
+                        help="generations to train for, counting the ones a resumed run already finished")
+    parser.add_argument("--pop-size", type=count(1), help="population size, overriding the config's pop_size")
+    parser.add_argument("--workers", type=count(1), default=WORKERS, help="worker processes evaluating the genomes")
+    parser.add_argument("--seed", type=int, default=SEED, help="seed of NEAT and of every generation's course")
+    display = parser.add_mutually_exclusive_group()
+    display.add_argument("--headless", action="store_true", help="never draw the game (same as --render-every 0)")
+    display.add_argument("--render-every", type=count(0), default=RENDER_EVERY, metavar="N",
+                         help="draw every Nth generation, 0 to never draw")
+    parser.add_argument("--fps", type=count(0), default=FPS or 0,
+                        help="frame rate cap of drawn generations, 0 for uncapped")
+    parser.add_argument("--resume", metavar="CHECKPOINT", help="resume training from a checkpoint file")
+    args = parser.parse_args()
+
+    GENERATIONS = args.generations
+    RENDER_EVERY = 0 if args.headless else args.render_every
+    FPS = args.fps or None
+    run(args.config, workers=args.workers, seed=args.seed, resume=args.resume, pop_size=args.pop_size)
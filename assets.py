@@ -0,0 +1,111 @@
+"""
+Lazy loading of the game's images and fonts. Nothing is loaded when the module is imported: an image is loaded, scaled
+and kept the first time it is asked for, so headless runs that never draw only ever load what the collision masks need,
+and never initialize the font module or open a display.
+
+Scaling the images up is done once: the scaled pixels are cached on disk, in CACHE_DIR, and later runs (and worker
+processes) read them back instead of decoding and scaling the PNGs again. A cached image is tied to the modification
+time and size of its source file, so editing an image makes it load from the PNG again. If the cache cannot be written,
+the images are simply loaded from the PNGs every time.
+"""
+
+import os
+import struct
+import tempfile
+
+import pygame
+
+IMG_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "Images", "imgs")
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "Images", "cache")
+
+"""
+The game's images: the file each one is loaded from and how it is scaled, 2 for pygame.transform.scale2x or a
+(width, height) size for pygame.transform.scale.
+"""
+IMAGES = {
+    "bird1": ("bird1.png", 2),
+    "bird2": ("bird2.png", 2),
+    "bird3": ("bird3.png", 2),
+    "pipe": ("pipe.png", 2),
+    "bg": ("bg.png", (600, 900)),
+    "base": ("base.png", 2),
+}
+
+_HEADER = struct.Struct("<II") # Width and height of a cached image, followed by its RGBA pixels
+
+
+class AssetManager:
+    def __init__(self, image_dir=IMG_DIR, cache_dir=CACHE_DIR):
+        self.image_dir = image_dir
+        self.cache_dir = cache_dir
+        self.images = {}
+        self.fonts = {}
+
+    # Returns the scaled image called name (see IMAGES), loading it the first time
+    def image(self, name):
+        image = self.images.get(name)
+        if image is None:
+            image = self.images[name] = self._load(name)
+        return image
+
+    """
+    Returns the "bold" system font at the given size, initializing pygame's font module the first time. Looking up
+    system fonts can be slow, so every size is only looked up once.
+    """
+    def font(self, size):
+        font = self.fonts.get(size)
+        if font is None:
+            pygame.font.init()
+            font = self.fonts[size] = pygame.font.SysFont("bold", size)
+        return font
+
+    """
+    Converts the loaded images to the display's pixel format for fast blitting, which needs a video mode to be set.
+    Opaque images lose their alpha channel, so they are blitted without alpha blending.
+    """
+    def convert(self, opaque=("bg",)):
+        for name, image in self.images.items():
+            self.images[name] = image.convert() if name in opaque else image.convert_alpha()
+
+    # The cache file of an image, named after the image, its scaling and the state of its source file
+    def _cache_path(self, name, source):
+        stat = os.stat(source)
+        scale = IMAGES[name][1]
+        scale = "x2" if scale == 2 else "{0}x{1}".format(*scale)
+        return os.path.join(self.cache_dir, "{0}-{1}-{2}-{3}.rgba".format(name, scale, stat.st_size, stat.st_mtime_ns))
+
+    def _load(self, name):
+        filename, scale = IMAGES[name]
+        source = os.path.join(self.image_dir, filename)
+        cache_path = self._cache_path(name, source)
+        try:
+            with open(cache_path, "rb") as f:
+                data = f.read()
+            width, height = _HEADER.unpack_from(data)
+            return pygame.image.frombytes(data[_HEADER.size:], (width, height), "RGBA")
+        except (OSError, ValueError, struct.error):
+            pass # Not cached yet (or unreadable), load it from the PNG
+
+        image = pygame.image.load(source)
+        image = pygame.transform.scale2x(image) if scale == 2 else pygame.transform.scale(image, scale)
+        self._save(image, cache_path)
+        return image
+
+    # Writes an image to the cache atomically, ignoring failures since the cache is only an optimization
+    def _save(self, image, cache_path):
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            data = _HEADER.pack(*image.get_size()) + pygame.image.tobytes(image, "RGBA")
+            fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, prefix=".tmp-")
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    f.write(data)
+                os.replace(tmp_path, cache_path)
+            except BaseException:
+                os.remove(tmp_path)
+                raise
+        except OSError:
+            pass
+
+
+assets = AssetManager() # The asset manager shared by the whole game
@@ -0,0 +1,238 @@
+"""
+Benchmarks for the simulation and the training loop, so the effect of a change to the engine, the networks or
+eval_genomes can be measured. Every benchmark is seeded and writes its results as JSON, one record per measurement,
+so the output of two runs can be compared directly:
+
+    python benchmark.py --output before.json
+    ... change something ...
+    python benchmark.py --output after.json
+
+The benchmarks are:
+- sim: frames per second of the headless simulation (both engines) at population sizes 50, 500 and 5000. The birds are
+  flown by a fixed autopilot instead of networks, so only the simulation is measured.
+- run: wall time of every generation of run(), for a fixed seed and config.
+- collision: time per call of the pixel perfect mask test, of a full bird/pipe check and of a batched check.
+- network: time per call of BatchedNetworks.activate for a whole population, and of neat's own network for one genome.
+
+Every time is the best of --repeat runs, which is the least noisy estimate of what the code itself costs.
+"""
+
+import argparse
+import contextlib
+import json
+import os
+import platform
+import random
+import re
+import sys
+import tempfile
+import time
+import timeit
+
+import numpy as np
+import neat
+
+import AI_Flappy_Bird as game
+from simulation import (BIRD_X, BirdState, PipeState, Simulation, BatchedSimulation, BirdArrays, PipeSchedule,
+                        CollisionStats)
+from network import BatchedNetworks
+
+LOCAL_DIR = os.path.dirname(os.path.abspath(__file__))
+CONFIG_FILE = os.path.join(LOCAL_DIR, "config_feedforward.txt")
+POPULATIONS = (50, 500, 5000)
+ENGINES = {"scalar": Simulation, "batched": BatchedSimulation}
+SEED = 1
+
+
+"""
+Returns the jump flags of the autopilot: every bird aims for its own height inside the gap of the pipe ahead, offset by
+up to 40 pixels, so the birds spread out, mostly survive and sometimes crash, like a trained population.
+"""
+def autopilot(sim, offsets):
+    target = sim.next_pipe.height + 80 + offsets
+    if isinstance(sim.birds, BirdArrays):
+        return sim.birds.y > target
+    return [bird.y > t for bird, t in zip(sim.birds, target)]
+
+# Steps a simulation of n_birds birds for the given number of frames (or until every bird is dead) and returns the time
+# spent stepping and the number of frames and bird frames simulated. The autopilot is not timed.
+def time_simulation(engine, n_birds, frames, seed):
+    sim = ENGINES[engine](n_birds, schedule=PipeSchedule(seed))
+    offsets = np.random.RandomState(seed).uniform(-40, 40, n_birds)
+    actions = None
+    bird_frames = 0
+    seconds = 0.0
+    while sim.frames < frames and len(sim.birds) > 0:
+        bird_frames += len(sim.birds)
+        start = time.perf_counter()
+        result = sim.step(actions)
+        seconds += time.perf_counter() - start
+        offsets = offsets[np.asarray(result.alive, dtype=bool)]
+        actions = autopilot(sim, offsets)
+    return seconds, sim.frames, bird_frames
+
+def bench_sim(args):
+    results = []
+    for engine in args.engines:
+        for n_birds in args.populations:
+            runs = [time_simulation(engine, n_birds, args.frames, args.seed) for _ in range(args.repeat)]
+            seconds, frames, bird_frames = min(runs)
+            results.append({"benchmark": "sim", "engine": engine, "population": n_birds, "frames": frames,
+                            "bird_frames": bird_frames, "seconds": seconds, "fps": frames / seconds,
+                            "bird_fps": bird_frames / seconds})
+    return results
+
+
+# A neat reporter recording the wall time of the evaluation of every generation
+class GenerationTimer(neat.reporting.BaseReporter):
+    def __init__(self):
+        self.times = []
+        self.start = None
+
+    def start_generation(self, generation):
+        self.start = time.perf_counter()
+
+    def post_evaluate(self, config, population, species, best_genome):
+        self.times.append(time.perf_counter() - self.start)
+
+"""
+Runs run() headless for a fixed number of generations and returns the time of each one. The config is a copy of
+config_feedforward.txt whose fitness threshold can never be reached, so every run lasts exactly the requested number
+of generations, and MAX_FRAMES ends generations whose birds never die. Checkpoints and NEAT's console output are left
+out of the measurement.
+"""
+def time_run(generations, max_frames, seed):
+    with open(CONFIG_FILE) as f:
+        config_text = re.sub(r"(?m)^fitness_threshold\s*=.*$", "fitness_threshold = 1e308", f.read())
+
+    settings = {name: getattr(game, name) for name in
+                ("RENDER_EVERY", "MAX_FRAMES", "GENERATIONS", "CHECKPOINT_EVERY", "BEST_GENOME_FILE", "PROFILE")}
+    with tempfile.TemporaryDirectory() as tmp:
+        config_path = os.path.join(tmp, "config_feedforward.txt")
+        with open(config_path, "w") as f:
+            f.write(config_text)
+        game.RENDER_EVERY = 0
+        game.MAX_FRAMES = max_frames
+        game.GENERATIONS = generations
+        game.CHECKPOINT_EVERY = 0
+        game.BEST_GENOME_FILE = os.path.join(tmp, "best_genome.pkl")
+        game.PROFILE = False
+        game.gen = 0
+        timer = GenerationTimer()
+        try:
+            with contextlib.redirect_stdout(sys.stderr):
+                game.run(config_path, workers=1, seed=seed, reporters=[timer])
+        finally:
+            for name, value in settings.items():
+                setattr(game, name, value)
+    return timer.times
+
+def bench_run(args):
+    runs = [time_run(args.generations, args.max_frames, args.seed) for _ in range(args.repeat)]
+    times = [min(generation) for generation in zip(*runs)]
+    return [{"benchmark": "run", "generation": generation, "seconds": seconds, "max_frames": args.max_frames}
+            for generation, seconds in enumerate(times)]
+
+
+# Returns the best time per call of stmt, in seconds, running it in batches of at least 0.2 seconds
+def time_call(stmt, repeat):
+    timer = timeit.Timer(stmt)
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat, number)) / number
+
+"""
+The collision benchmarks place a bird right next to the top pipe, horizontally overlapping the pipe and outside its
+gap, so both the mask test and the broad phase leading up to it have to run.
+"""
+def bench_collision(args):
+    pipe = PipeState(BIRD_X - 50, 300)
+    bird = BirdState(BIRD_X, 260)
+    stats = CollisionStats()
+    overlap = time_call(lambda: pipe.overlap(bird), args.repeat)
+    collide = time_call(lambda: pipe.collide(bird, stats), args.repeat)
+    results = [{"benchmark": "collision", "name": "mask_overlap", "seconds_per_call": overlap},
+               {"benchmark": "collision", "name": "pipe_collide", "seconds_per_call": collide}]
+    # The batched check gets birds spread over the whole height of the screen, most of them outside the gap
+    rng = np.random.RandomState(args.seed)
+    for n_birds in args.populations:
+        birds = BirdArrays(n_birds)
+        birds.y[:] = rng.uniform(0, 700, n_birds)
+        check = np.ones(n_birds, dtype=bool)
+        seconds = time_call(lambda: birds.collide(pipe, check, stats), args.repeat)
+        results.append({"benchmark": "collision", "name": "batched_collide", "population": n_birds,
+                        "seconds_per_call": seconds, "seconds_per_bird": seconds / n_birds})
+    return results
+
+
+# Creates n seeded random genomes, mutated a few times so they have some hidden nodes like evolved genomes
+def random_genomes(config, n, seed, mutations=10):
+    random.seed(seed)
+    genomes = []
+    for key in range(n):
+        genome = config.genome_type(key)
+        genome.configure_new(config.genome_config)
+        for _ in range(mutations):
+            genome.mutate(config.genome_config)
+        genomes.append(genome)
+    return genomes
+
+def bench_network(args):
+    config = neat.config.Config(neat.DefaultGenome, neat.DefaultReproduction, neat.DefaultSpeciesSet,
+                                neat.DefaultStagnation, CONFIG_FILE)
+    rng = np.random.RandomState(args.seed)
+    results = []
+    for n_birds in args.populations:
+        genomes = random_genomes(config, n_birds, args.seed)
+        nets = BatchedNetworks.create(genomes, config)
+        inputs = rng.uniform(0, 700, (n_birds, nets.num_inputs))
+        seconds = time_call(lambda: nets.activate(inputs), args.repeat)
+        results.append({"benchmark": "network", "name": "batched_activate", "population": n_birds,
+                        "seconds_per_call": seconds, "seconds_per_network": seconds / n_birds})
+
+    net = neat.nn.FeedForwardNetwork.create(random_genomes(config, 1, args.seed)[0], config)
+    inputs = list(rng.uniform(0, 700, len(config.genome_config.input_keys)))
+    results.append({"benchmark": "network", "name": "neat_activate", "population": 1,
+                    "seconds_per_call": time_call(lambda: net.activate(inputs), args.repeat)})
+    return results
+
+
+BENCHMARKS = {"sim": bench_sim, "run": bench_run, "collision": bench_collision, "network": bench_network}
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the flappy bird simulation and training loop.")
+    parser.add_argument("benchmarks", nargs="*", metavar="BENCHMARK",
+                        help="benchmarks to run, out of {0} (default: all)".format(", ".join(BENCHMARKS)))
+    parser.add_argument("--output", help="write the JSON results to this file instead of stdout")
+    parser.add_argument("--repeat", type=game.count(1), default=3, help="runs per measurement, the best one is kept")
+    parser.add_argument("--seed", type=int, default=SEED)
+    parser.add_argument("--populations", type=game.count(1), nargs="+", default=list(POPULATIONS))
+    parser.add_argument("--engines", nargs="+", choices=list(ENGINES), default=list(ENGINES))
+    parser.add_argument("--frames", type=game.count(1), default=1000, help="frames per simulation run")
+    parser.add_argument("--generations", type=game.count(1), default=5, help="generations per training run")
+    parser.add_argument("--max-frames", type=game.count(1), default=2000, help="frame limit of each training generation")
+    args = parser.parse_args()
+    for name in args.benchmarks:
+        if name not in BENCHMARKS:
+            parser.error("unknown benchmark {0!r}".format(name))
+
+    results = []
+    for name in args.benchmarks or list(BENCHMARKS):
+        print("Running {0} benchmark...".format(name), file=sys.stderr)
+        results.extend(BENCHMARKS[name](args))
+
+    report = {
+        "meta": {"time": time.strftime("%Y-%m-%dT%H:%M:%S"), "python": platform.python_version(),
+                 "numpy": np.__version__, "platform": platform.platform(), "processor": platform.processor(),
+                 "args": vars(args)},
+        "results": results,
+    }
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
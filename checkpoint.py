@@ -0,0 +1,119 @@
+"""
+Saving and restoring training progress. Checkpointer periodically writes the whole NEAT population to disk, so a
+crashed or closed run can be resumed where it left off, and BestGenomeSaver keeps the best genome found so far in its
+own file, so it can be reloaded to play the game without any of the training state.
+
+Every file is a gzipped pickle, written to a temporary file next to its destination and then renamed over it, so an
+interrupted write never leaves a truncated checkpoint behind.
+"""
+
+import gzip
+import itertools
+import os
+import pickle
+import random
+import tempfile
+
+import neat
+
+
+"""
+Pickles obj with the highest protocol, compresses it and atomically replaces filename with the result. Compression
+level 1 keeps saving cheap enough to do every generation while still shrinking the pickles several times over.
+"""
+def save_object(obj, filename):
+    data = gzip.compress(pickle.dumps(obj, protocol=pickle.HIGHEST_PROTOCOL), compresslevel=1)
+    directory = os.path.dirname(os.path.abspath(filename))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".tmp-")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, filename)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+
+# Loads an object written by save_object
+def load_object(filename):
+    with gzip.open(filename, "rb") as f:
+        return pickle.load(f)
+
+# Saves a single genome, e.g. the winner of a run, so it can be played later (see load_genome)
+def save_genome(genome, filename):
+    save_object(genome, filename)
+
+# Loads a genome saved by save_genome or BestGenomeSaver
+def load_genome(filename):
+    return load_object(filename)
+
+
+"""
+A neat.Checkpointer that writes its checkpoints with save_object, and also stores the best genome seen so far, which
+neat's checkpoints leave out.
+
+A checkpoint is written at the end of a generation, after the next generation has been bred but before it is evaluated,
+so it records the number of that next generation. Resuming therefore starts with the first generation that was never
+evaluated, instead of replaying the last finished one under its old number like neat's checkpoints do. The random
+module's state is saved too, so a seeded run that is resumed continues exactly like the uninterrupted run would have.
+"""
+class Checkpointer(neat.Checkpointer):
+    def __init__(self, generation_interval=1, time_interval_seconds=None, filename_prefix="neat-checkpoint-",
+                 best_genome=None):
+        super().__init__(generation_interval, time_interval_seconds, filename_prefix)
+        self.best_genome = best_genome
+
+    # Track the best genome ever seen, the same way neat.Population does
+    def post_evaluate(self, config, population, species, best_genome):
+        if self.best_genome is None or best_genome.fitness > self.best_genome.fitness:
+            self.best_genome = best_genome
+
+    def save_checkpoint(self, config, population, species_set, generation):
+        filename = "{0}{1}".format(self.filename_prefix, generation)
+        print("Saving checkpoint to {0}".format(filename))
+
+        """
+        The species set holds on to the population's reporters (every StatisticsReporter's full history included). They
+        are left out of the checkpoint and replaced by the resumed population's own reporters in restore_checkpoint.
+        """
+        reporters = species_set.reporters
+        species_set.reporters = None
+        try:
+            data = (generation + 1, config, population, species_set, random.getstate(), self.best_genome)
+            save_object(data, filename)
+        finally:
+            species_set.reporters = reporters
+
+    """
+    Rebuilds the population saved in a checkpoint, ready to run its next generation. The config is the one the
+    checkpoint was saved with.
+    """
+    @staticmethod
+    def restore_checkpoint(filename):
+        generation, config, population, species_set, rndstate, best_genome = load_object(filename)
+        random.setstate(rndstate)
+        p = neat.Population(config, (population, species_set, generation))
+        species_set.reporters = p.reporters
+        p.best_genome = best_genome
+        """
+        New genome ids continue after the newest genome of the saved population, which is the last id handed out before
+        the checkpoint. Otherwise the resumed run would hand out ids that are already taken.
+        """
+        p.reproduction.genome_indexer = itertools.count(max(population) + 1)
+        return p
+
+
+"""
+Saves the best genome to filename every time a generation beats it, so the best bird of a run survives a crash and can
+be reloaded with load_genome.
+"""
+class BestGenomeSaver(neat.reporting.BaseReporter):
+    def __init__(self, filename="best_genome.pkl", best_genome=None):
+        self.filename = filename
+        self.best_genome = best_genome
+
+    def post_evaluate(self, config, population, species, best_genome):
+        if self.best_genome is None or best_genome.fitness > self.best_genome.fitness:
+            self.best_genome = best_genome
+            save_genome(best_genome, self.filename)
@@ -0,0 +1,170 @@
+"""
+Compiled feed-forward networks. neat.nn.FeedForwardNetwork keeps every network as a graph of Python dicts and walks it
+node by node for every bird on every frame. Here each genome is compiled once into flat arrays (its nodes in
+topological order, the biases of the nodes and the source and weight of every connection), and BatchedNetworks stacks
+the compiled networks of a whole population so that a single call evaluates all of them on a matrix of inputs.
+
+Only the sum aggregation and the tanh activation used in config_feedforward.txt are supported. Every node adds up its
+inputs one at a time in the same order as neat's activate does and uses the same tanh, so up to Python 3.11 the outputs
+are identical to neat's. From Python 3.12 on, the builtin sum() that neat aggregates with uses compensated summation,
+so neat's outputs can differ from these in the last bits. Every game (training, parallel workers and replays) evaluates
+genomes with these networks, so a genome's fitness never depends on which of them it was played in.
+"""
+
+import copy
+import itertools
+import math
+
+import numpy as np
+from neat.graphs import feed_forward_layers
+
+
+"""
+neat's tanh activation, which scales its input by 2.5 and clamps it to [-60, 60] before taking the tanh. np.tanh would be
+faster, but it rounds differently from math.tanh in about a quarter of cases, which would make the outputs drift from
+neat's even where the sums agree.
+"""
+def tanh_activation(z):
+    z = np.clip(2.5 * z, -60.0, 60.0)
+    return np.array([math.tanh(v) for v in z.tolist()], dtype=np.float64)
+
+
+"""
+A single genome compiled into arrays. Values are stored in slots: the network's inputs take the first slots, followed by
+every evaluated node in topological order. For each node, depths holds the layer it belongs to (nodes in the same layer
+never feed each other) and links holds its incoming connections as (source slot, weight) pairs, in neat's order.
+output_slots holds the slot of each output, or -1 for an output that no connection reaches, which is always 0.
+"""
+class CompiledNetwork:
+    def __init__(self, num_inputs, depths, biases, responses, links, output_slots):
+        self.num_inputs = num_inputs
+        self.depths = depths
+        self.biases = biases
+        self.responses = responses
+        self.links = links
+        self.output_slots = output_slots
+
+    # Compiles a genome, walking it the same way neat.nn.FeedForwardNetwork.create does
+    @staticmethod
+    def create(genome, config):
+        genome_config = config.genome_config
+        connections = [cg.key for cg in genome.connections.values() if cg.enabled]
+        layers = feed_forward_layers(genome_config.input_keys, genome_config.output_keys, connections)
+
+        slots = {key: i for i, key in enumerate(genome_config.input_keys)}
+        depths = []
+        biases = []
+        responses = []
+        links = []
+        for depth, layer in enumerate(layers, 1):
+            for node in layer:
+                ng = genome.nodes[node]
+                if ng.activation != "tanh" or ng.aggregation != "sum":
+                    raise ValueError("Only the tanh activation and sum aggregation can be compiled, node {} uses {} "
+                                     "and {}".format(node, ng.activation, ng.aggregation))
+                node_links = [(slots[i], genome.connections[(i, o)].weight) for i, o in connections if o == node]
+                slots[node] = len(slots)
+                depths.append(depth)
+                biases.append(ng.bias)
+                responses.append(ng.response)
+                links.append(node_links)
+
+        output_slots = [slots.get(key, -1) for key in genome_config.output_keys]
+        return CompiledNetwork(len(genome_config.input_keys), depths, biases, responses, links, output_slots)
+
+    # Total number of value slots, inputs included
+    def num_slots(self):
+        return self.num_inputs + len(self.depths)
+
+
+"""
+The compiled networks of a population, stacked so they can all be evaluated at once. Network n owns a row of slots in a
+(networks x slots) value matrix, with one extra slot at the end of the row that is always 0; padding and unreachable
+outputs point to it. For every depth, the nodes of all networks at that depth are listed in flat arrays (their position
+in the value matrix, the positions of their sources, their weights, biases and responses), so evaluating a depth takes
+a few array operations no matter how many networks there are.
+"""
+class BatchedNetworks:
+    def __init__(self, networks):
+        self.networks = list(networks)
+        self.num_inputs = self.networks[0].num_inputs if self.networks else 0
+        num_outputs = len(self.networks[0].output_slots) if self.networks else 0
+        self.width = max((net.num_slots() for net in self.networks), default=self.num_inputs) + 1
+        zero = self.width - 1
+
+        by_depth = {}
+        output_slots = []
+        for n, net in enumerate(self.networks):
+            row = n * self.width
+            for node, depth in enumerate(net.depths):
+                slot = net.num_inputs + node
+                sources = [row + s for s, w in net.links[node]]
+                weights = [w for s, w in net.links[node]]
+                by_depth.setdefault(depth, []).append((row + slot, sources, weights, net.biases[node],
+                                                       net.responses[node]))
+            output_slots.append([zero if s == -1 else s for s in net.output_slots])
+
+        self.output_slots = np.array(output_slots, dtype=np.int64).reshape(len(self.networks), num_outputs)
+        self.layers = []
+        for depth in sorted(by_depth):
+            nodes = by_depth[depth]
+            fan_in = max(len(sources) for _, sources, _, _, _ in nodes)
+            positions = np.array([position for position, _, _, _, _ in nodes], dtype=np.int64)
+            # Nodes with fewer connections are padded with weight 0 connections from their network's zero slot
+            sources = np.array([s + [position - position % self.width + zero] * (fan_in - len(s))
+                                for position, s, _, _, _ in nodes], dtype=np.int64).reshape(len(nodes), fan_in)
+            weights = np.array([w + [0.0] * (fan_in - len(w)) for _, _, w, _, _ in nodes],
+                               dtype=np.float64).reshape(len(nodes), fan_in)
+            biases = np.array([bias for _, _, _, bias, _ in nodes], dtype=np.float64)
+            responses = np.array([response for _, _, _, _, response in nodes], dtype=np.float64)
+            self.layers.append((positions, sources, weights, biases, responses))
+
+    # Compiles the networks of a list of genomes
+    @staticmethod
+    def create(genomes, config):
+        return BatchedNetworks(CompiledNetwork.create(genome, config) for genome in genomes)
+
+    def __len__(self):
+        return len(self.networks)
+
+    """
+    Evaluates every network on its own row of inputs, a (networks x inputs) matrix, and returns a (networks x outputs)
+    matrix. The connections of each node are added one at a time, in neat's order, starting from 0.
+    """
+    def activate(self, inputs):
+        values = np.zeros((len(self.networks), self.width), dtype=np.float64)
+        values[:, :self.num_inputs] = inputs
+        flat = values.reshape(-1)
+
+        for positions, sources, weights, biases, responses in self.layers:
+            total = np.zeros(len(positions), dtype=np.float64)
+            for k in range(sources.shape[1]):
+                total += flat[sources[:, k]] * weights[:, k]
+            flat[positions] = tanh_activation(biases + responses * total)
+
+        return np.take_along_axis(values, self.output_slots, axis=1)
+
+    """
+    Returns the networks selected by the boolean sequence mask, stacked on their own. Nothing is compiled again: the
+    nodes of the dropped networks are filtered out of every layer's arrays, and the rows of the remaining networks are
+    renumbered, so removing networks costs a few array operations per depth however many nodes the networks have.
+    """
+    def keep(self, mask):
+        mask = np.asarray(mask, dtype=bool)
+        rows = np.cumsum(mask) - 1 # The new row of every kept network
+
+        # Moves value matrix positions from their network's old row to its new one, keeping their slot
+        def renumber(positions):
+            return rows[positions // self.width] * self.width + positions % self.width
+
+        kept = copy.copy(self)
+        kept.networks = list(itertools.compress(self.networks, mask))
+        kept.output_slots = self.output_slots[mask]
+        kept.layers = []
+        for positions, sources, weights, biases, responses in self.layers:
+            selected = mask[positions // self.width]
+            if not selected.any():
+                continue
+            kept.layers.append((renumber(positions[selected]), renumber(sources[selected]), weights[selected],
+                                biases[selected], responses[selected]))
+        return kept
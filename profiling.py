@@ -0,0 +1,109 @@
+"""
+Per-phase frame timings. A FrameTimer splits the time of every frame between the phases of the game loop (running the
+neural networks, moving the birds, checking collisions, managing the pipes and drawing), and ProfileReporter reports
+how long each phase took per frame over a generation, as a neat reporter.
+
+The simulation and eval_genomes report every phase to a timer, which is NULL_TIMER unless profiling is switched on.
+NULL_TIMER does nothing at all, so leaving profiling off only costs a few empty method calls per frame.
+"""
+
+import time
+
+import numpy as np
+import neat
+
+
+PHASES = ("inference", "physics", "collision", "pipes", "rendering")
+PERCENTILES = (50, 90, 99)
+
+
+"""
+Collects the time spent in every phase, one sample per phase per frame. start() (re)starts the clock, lap(phase) adds
+the time since the last start() or lap() to the given phase, and end_frame() records the frame's totals. Time between
+a lap and the next start() is not counted towards any phase.
+"""
+class FrameTimer:
+    def __init__(self):
+        self.samples = {phase: [] for phase in PHASES}
+        self.current = dict.fromkeys(PHASES, 0.0)
+        self.last = time.perf_counter()
+
+    def start(self):
+        self.last = time.perf_counter()
+
+    def lap(self, phase):
+        now = time.perf_counter()
+        self.current[phase] += now - self.last
+        self.last = now
+
+    def end_frame(self):
+        for phase, seconds in self.current.items():
+            self.samples[phase].append(seconds)
+            self.current[phase] = 0.0
+
+    # Number of frames recorded since the last reset
+    def frames(self):
+        return len(self.samples[PHASES[0]])
+
+    def reset(self):
+        for phase in PHASES:
+            self.samples[phase] = []
+            self.current[phase] = 0.0
+
+    """
+    Summarizes the recorded frames: for every phase, the total time in seconds and the PERCENTILES of the time per frame
+    in milliseconds.
+    """
+    def summary(self):
+        summary = {}
+        for phase in PHASES:
+            samples = np.array(self.samples[phase], dtype=np.float64)
+            percentiles = np.percentile(samples * 1000, PERCENTILES) if len(samples) else [0.0] * len(PERCENTILES)
+            summary[phase] = {"total": float(samples.sum()),
+                              "percentiles": dict(zip(PERCENTILES, (float(p) for p in percentiles)))}
+        return summary
+
+
+# A timer that ignores everything, used whenever profiling is off
+class NullTimer:
+    def start(self):
+        pass
+
+    def lap(self, phase):
+        pass
+
+    def end_frame(self):
+        pass
+
+
+NULL_TIMER = NullTimer()
+frame_timer = FrameTimer() # The timer eval_genomes uses when profiling is on
+
+
+"""
+Prints the per-phase frame timings of every generation, right after its evaluation, and keeps their summaries in
+self.history. Only frames recorded by the timer in this process are seen, so genomes evaluated by worker processes are
+not profiled.
+"""
+class ProfileReporter(neat.reporting.BaseReporter):
+    def __init__(self, timer=frame_timer):
+        self.timer = timer
+        self.history = []
+
+    def start_generation(self, generation):
+        self.timer.reset()
+
+    def post_evaluate(self, config, population, species, best_genome):
+        summary = self.timer.summary()
+        self.history.append(summary)
+        frames = self.timer.frames()
+        total = sum(phase["total"] for phase in summary.values())
+
+        print("Frame time per phase over {0} frames:".format(frames))
+        print("   {0:<10} {1:>9} {2:>6} {3}".format("phase", "total s", "share",
+                                                  " ".join("{0:>8}".format("p{0} ms".format(p)) for p in PERCENTILES)))
+        for phase, stats in summary.items():
+            share = stats["total"] / total if total else 0.0
+            print("   {0:<10} {1:>9.3f} {2:>6.1%} {3}".format(phase, stats["total"], share,
+                                                        " ".join("{0:>8.4f}".format(v)
+                                                                 for v in stats["percentiles"].values())))
@@ -0,0 +1,192 @@
+"""
+Plays a trained genome, such as the best_genome.pkl saved by training (see checkpoint.py), without training anything:
+
+    python replay.py best_genome.pkl --render            # watch it fly one course
+    python replay.py best_genome.pkl                     # fly the same course headless, as fast as possible
+    python replay.py best_genome.pkl --courses 5000 --workers 8 --output champion.json
+
+Every mode reports the score (pipes passed), the frames flown and the frames per second, and --output writes them to a
+JSON file too. With --courses, the genome flies that many seeded courses, the courses of seeds --seed, --seed + 1, ...,
+so the same genome always gets the same scores, and the score distribution can be compared between two genomes or two
+versions of the game as a regression check. The courses are flown in chunks, every chunk in a single
+MultiWorldSimulation with one bird per course, and the chunks are spread over --workers processes.
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import time
+from collections import namedtuple
+
+import numpy as np
+import neat
+import pygame
+
+import AI_Flappy_Bird as game
+from simulation import Simulation, MultiWorldSimulation, PipeSchedule
+from network import CompiledNetwork, BatchedNetworks
+from checkpoint import load_genome
+
+LOCAL_DIR = os.path.dirname(os.path.abspath(__file__))
+CONFIG_FILE = os.path.join(LOCAL_DIR, "config_feedforward.txt")
+MAX_FRAMES = 10000 # A champion may never die, so every game ends after this many frames unless told otherwise
+CHUNK = 250 # Courses flown together in one MultiWorldSimulation
+
+Replay = namedtuple("Replay", ["score", "frames", "seconds"]) # The outcome of a single game and its wall time
+
+
+def load_config(config_file=CONFIG_FILE):
+    return neat.config.Config(neat.DefaultGenome, neat.DefaultReproduction, neat.DefaultSpeciesSet,
+                              neat.DefaultStagnation, config_file)
+
+"""
+Plays genome on the course of schedule in the game window, at fps frames per second (None for uncapped), until the
+bird dies, a limit is hit or the window is closed.
+"""
+def play_rendered(genome, config, schedule, limits, fps=game.FPS):
+    win = game.init_display()
+    nets = BatchedNetworks.create([genome], config)
+    extended = game.extended_inputs(config)
+    sim = Simulation(1, game.Bird, game.Pipe, game.Base, schedule=schedule)
+    clock = pygame.time.Clock()
+    actions = None
+    start = time.perf_counter()
+    while len(sim.birds) > 0 and not game.out_of_time(sim, limits):
+        if fps:
+            clock.tick(fps)
+        if any(event.type == pygame.QUIT for event in pygame.event.get()):
+            break
+        sim.step(actions)
+        if len(sim.birds) > 0:
+            actions = nets.activate(sim.observe(extended))[:, 0] > 0.5
+        game.draw_window(win, sim.birds, sim.pipes, sim.base, sim.score, 1, sim.pipe_ind)
+    return Replay(sim.score, sim.frames, time.perf_counter() - start)
+
+# Plays genome on the course of schedule headless, exactly like a worker of a parallel training run (see play_genome)
+def play_headless(genome, config, schedule, limits):
+    start = time.perf_counter()
+    fitness, frames, score = game.play_genome(genome, config, schedule, limits)
+    return Replay(score, frames, time.perf_counter() - start)
+
+"""
+Flies genome on the course of every seed in seeds at once, and returns the score and the number of frames of every
+course, as arrays in the order of seeds. A course's score and frames are those of the world when its bird died, so
+they are exactly what play_headless gets on the same course.
+"""
+def play_courses(genome, config, seeds, limits):
+    seeds = list(seeds)
+    nets = BatchedNetworks([CompiledNetwork.create(genome, config)] * len(seeds))
+    extended = game.extended_inputs(config)
+    sim = MultiWorldSimulation(1, [PipeSchedule(seed) for seed in seeds])
+    scores = np.zeros(len(seeds), dtype=np.int64)
+    frames = np.zeros(len(seeds), dtype=np.int64)
+    actions = None
+
+    while len(sim.birds) > 0 and not game.out_of_time(sim, limits):
+        worlds = sim.birds.world
+        result = sim.step(actions)
+        if result.crashed or result.fell:
+            dead = worlds[~np.asarray(result.alive, dtype=bool)]
+            scores[dead] = sim.score
+            frames[dead] = sim.frames
+            nets = nets.keep(result.alive)
+        if len(sim.birds) > 0:
+            actions = nets.activate(sim.observe(extended))[:, 0] > 0.5
+
+    # The birds still flying when a limit ends the game
+    scores[sim.birds.world] = sim.score
+    frames[sim.birds.world] = sim.frames
+    return scores, frames
+
+# play_courses taking its arguments as one tuple, for Pool.map
+def _play_chunk(args):
+    return play_courses(*args)
+
+"""
+Flies genome on courses seeded courses, starting at seed, split into chunks of chunk courses over workers processes,
+and summarizes the scores. at_limit counts the courses the bird was still flying when a limit ended the game. frames
+counts the frames of every course, so fps is the number of game frames simulated per second of wall time, over all
+workers.
+"""
+def benchmark_courses(genome, config, courses, seed, limits, workers=1, chunk=CHUNK):
+    chunks = [(genome, config, range(first, min(first + chunk, seed + courses)), limits)
+              for first in range(seed, seed + courses, chunk)]
+    start = time.perf_counter()
+    if workers > 1:
+        with multiprocessing.Pool(workers) as pool:
+            results = pool.map(_play_chunk, chunks)
+    else:
+        results = [_play_chunk(args) for args in chunks]
+    seconds = time.perf_counter() - start
+
+    scores = np.concatenate([scores for scores, frames in results])
+    frames = np.concatenate([frames for scores, frames in results])
+    at_limit = np.zeros(courses, dtype=bool)
+    if limits.max_frames is not None:
+        at_limit |= frames >= limits.max_frames
+    if limits.max_score is not None:
+        at_limit |= scores >= limits.max_score
+    return {
+        "courses": courses, "seed": seed, "max_frames": limits.max_frames, "max_score": limits.max_score,
+        "mean_score": float(scores.mean()), "stdev_score": float(scores.std()), "min_score": int(scores.min()),
+        "median_score": float(np.median(scores)), "best_score": int(scores.max()),
+        "at_limit": int(np.count_nonzero(at_limit)),
+        "frames": int(frames.sum()), "seconds": seconds, "fps": float(frames.sum()) / seconds,
+    }
+
+# Writes the results of a replay or a benchmark of the given genome file as JSON
+def write_results(filename, genome_file, results):
+    with open(filename, "w") as f:
+        f.write(json.dumps({"genome": genome_file, "results": results}, indent=2) + "\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Play a saved genome, rendered or headless, or benchmark it.")
+    parser.add_argument("genome", help="genome file saved by training (e.g. best_genome.pkl)")
+    parser.add_argument("--config", default=CONFIG_FILE, help="NEAT config file the genome was trained with")
+    parser.add_argument("--render", action="store_true", help="draw the game in a window")
+    parser.add_argument("--fps", type=game.count(0), default=game.FPS,
+                        help="frame rate cap when rendering, 0 for uncapped")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the (first) course")
+    parser.add_argument("--courses", type=game.count(0), default=0,
+                        help="benchmark the genome on this many seeded courses")
+    parser.add_argument("--workers", type=game.count(1), default=1, help="processes to spread the courses over")
+    parser.add_argument("--chunk", type=game.count(1), default=CHUNK, help="courses flown together by one process")
+    parser.add_argument("--max-frames", type=game.count(0), default=MAX_FRAMES,
+                        help="end every game after this many frames, 0 for no limit")
+    parser.add_argument("--max-score", type=game.count(0), default=0,
+                        help="end every game at this score, 0 for no limit")
+    parser.add_argument("--output", help="write the results as JSON to this file")
+    args = parser.parse_args()
+    if args.courses and args.render:
+        parser.error("--courses cannot be combined with --render")
+
+    genome = load_genome(args.genome)
+    config = load_config(args.config)
+    limits = game.Limits(args.max_frames or None, args.max_score or None, None)
+
+    if args.courses:
+        report = benchmark_courses(genome, config, args.courses, args.seed, limits, args.workers, args.chunk)
+        print("{courses} courses: mean score {mean_score:.2f} (stdev {stdev_score:.2f}, min {min_score}, median "
+              "{median_score:g}, max {best_score}), {at_limit} still flying at the limit".format(**report))
+        print("{frames} frames in {seconds:.2f} s, {fps:.0f} frames per second".format(**report))
+        if args.output:
+            write_results(args.output, args.genome, report)
+        return
+
+    if args.render:
+        replay = play_rendered(genome, config, PipeSchedule(args.seed), limits, args.fps or None)
+    else:
+        replay = play_headless(genome, config, PipeSchedule(args.seed), limits)
+    fps = replay.frames / replay.seconds if replay.seconds > 0 else 0.0
+    print("Score {0} after {1} frames, {2:.0f} frames per second".format(replay.score, replay.frames, fps))
+    if args.output:
+        write_results(args.output, args.genome, {
+            "seed": args.seed, "rendered": args.render, "max_frames": limits.max_frames, "max_score": limits.max_score,
+            "score": replay.score, "frames": replay.frames, "seconds": replay.seconds, "fps": fps,
+        })
+
+
+if __name__ == "__main__":
+    main()
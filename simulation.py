@@ -0,0 +1,705 @@
+"""
+The flappy bird simulation engine. Bird, pipe and floor state is kept as plain numbers so that the game can be stepped
+without a display or any pygame Surfaces. The Bird, Pipe and Base classes in AI_Flappy_Bird.py are thin renderers on top
+of the classes in this module.
+"""
+
+import random # random is for randomly placing the height of the tubes (see PipeSchedule)
+from collections import deque, namedtuple
+
+import numpy as np
+import pygame
+
+from assets import assets
+from profiling import NULL_TIMER
+
+# Dimensions of the game world
+WIN_WIDTH = 600
+WIN_HEIGHT = 800
+FLOOR = 730
+
+"""
+Sizes of the sprites after they are scaled up 2x. The engine only needs these numbers to move things around, so it never
+has to look at an image except to build collision masks.
+"""
+BIRD_WIDTH = 68
+BIRD_HEIGHT = 48
+PIPE_WIDTH = 104
+PIPE_HEIGHT = 640
+BASE_WIDTH = 672
+
+BIRD_X = 230 # Every bird starts at (BIRD_X, BIRD_Y) and only ever moves vertically
+BIRD_Y = 350
+PIPE_START_X = 700 # x position of the first pipe of every game
+
+"""
+Collision masks, shared by every bird and pipe: bird holds one mask per bird animation frame (the bird's tilt is not 
+part of it, since collisions are checked against the unrotated image), and the top pipe is the pipe image flipped 
+vertically. They are built from the images of the asset manager, which are never converted with convert_alpha(); the 
+masks are identical to the masks of the converted images that are drawn on screen.
+"""
+Masks = namedtuple("Masks", ["bird", "pipe_bottom", "pipe_top"])
+
+_masks = None
+
+# Returns the collision masks, building them the first time they are needed rather than when the module is imported
+def collision_masks():
+    global _masks
+    if _masks is None:
+        pipe = assets.image("pipe")
+        _masks = Masks([pygame.mask.from_surface(assets.image("bird" + str(x))) for x in range(1, 4)],
+                       pygame.mask.from_surface(pipe),
+                       pygame.mask.from_surface(pygame.transform.flip(pipe, False, True)))
+    return _masks
+
+"""
+Counts what the collision broad phase did with the bird/pipe pairs it was given: how many were ruled out because the
+bird was horizontally clear of the pipe, how many because the bird was inside the gap, and how many needed the pixel
+perfect mask test. Each process keeps its own counts in collision_stats.
+"""
+class CollisionStats:
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.pairs = 0
+        self.x_rejected = 0
+        self.gap_accepted = 0
+        self.mask_tests = 0
+        self.hits = 0
+
+    # Number of pairs that never reached the mask test
+    def eliminated(self):
+        return self.x_rejected + self.gap_accepted
+
+    def __str__(self):
+        share = 100 * self.eliminated() / self.pairs if self.pairs else 0
+        return ("{} bird/pipe pairs, {} ({:.1f}%) eliminated by the broad phase ({} clear of the pipe, {} inside the "
+                "gap), {} mask tests, {} hits".format(self.pairs, self.eliminated(), share, self.x_rejected,
+                                                       self.gap_accepted, self.mask_tests, self.hits))
+
+collision_stats = CollisionStats()
+
+"""
+The outcome of a single frame. crashed and fell hold the indices (into Simulation.birds, before the dead birds were
+removed) of the birds that hit a pipe and of the birds that hit the floor or flew off the top of the screen. passed is
+True if a pipe was passed during the frame. alive holds one flag per bird from before the frame, True for the birds that
+are still in Simulation.birds; filtering any list that runs parallel to the birds with it keeps the list in sync.
+"""
+StepResult = namedtuple("StepResult", ["crashed", "fell", "passed", "alive"])
+
+"""
+The neural network inputs observe() returns for every bird, in order. BASIC_INPUTS are the three inputs the networks of 
+config_feedforward.txt take: the bird's y position and its vertical distance to the top and the bottom pipe of the pipe 
+it is looking at. EXTENDED_INPUTS add the bird's vertical velocity (the pixels it moved down on its last frame, 
+negative when it rose) and its horizontal distance to that pipe, for configs with num_inputs = 5.
+"""
+BASIC_INPUTS = ("y", "top_distance", "bottom_distance")
+EXTENDED_INPUTS = BASIC_INPUTS + ("velocity", "pipe_distance")
+
+
+# The state of a single bird
+class BirdState:
+    MAX_ROTATION = 25  # Maximum tilt angle for the bird in degrees
+    ROT_VEL = 20 # Rotation velocity for the bird in degrees per frame
+    ANIMATION_TIME = 5 # Duration to display each bird animation frame, affecting wing flap speed
+
+    def __init__(self, x, y):
+        self.x = x # Bird's starting x position
+        self.y = y # Bird's starting y position
+        self.tilt = 0  # Initial tilt angle of the bird image, starting flat (0 degrees)
+        self.tick_count = 0
+        self.vel = 0
+        self.displacement = 0 # Pixels the bird moved down on its last move (negative when it moved up)
+        self.height = self.y
+        self.img_count = 0 # Counter to track the current bird image for animation
+        self.frame = 0 # Index of the current animation frame (0 is bird1.png, 1 is bird2.png, 2 is bird3.png)
+
+    # Make the bird jump
+    def jump(self):
+        """
+        Initial velocity of the bird, negative to move upwards in pygame coordinates where (0,0) is the top left of
+        the screen.
+        """
+        self.vel = -10.5
+        self.tick_count = 0 # Keeps track of the time since the bird last jumped
+        self.height = self.y # Keeps track of the vertical position from which the bird last jumped
+
+    # Make the bird move
+    def move(self):
+        self.tick_count += 1
+        """
+        displacement calculates how many pixels the bird moves up or down in each frame. The self.tick_count keeps
+        track of the number of frames since the bird last jumped. When the bird changes direction or its velocity,
+        self.tick_count increases accordingly. Initially, when the bird jumps, self.tick_count is reset to 0, and
+        self.height is set to self.y (self.height = self.y), while the bird's velocity is set to -10.5
+        (self.velocity = -10.5). For instance, when self.tick_count = 1, displacement is calculated as
+        -10.5 * 1 + 0.5 * 3 * 1 ** 2 = -9. This means the bird moves 9 pixels upwards in this frame. In subsequent
+        frames, the bird continues to move upwards less and less until displacement becomes 0. Then, the bird
+        starts descending, moving positively again, resulting in an arc-like trajectory for its jump.
+        """
+        displacement = self.vel*(self.tick_count) + 0.5*(3)*(self.tick_count)**2  # calculate displacement
+
+        """
+        Ensures the bird's velocity does not exceed a terminal velocity in either upward or downward motion
+        """
+        if displacement >= 16:
+            displacement = (displacement/abs(displacement)) * 16
+
+        if displacement < 0:
+            """
+            Adjusts the displacement when the bird is moving upwards, allowing it to ascend slightly more
+            """
+            displacement -= 2
+
+        self.y = self.y + displacement # Update the bird's vertical position based on the calculated displacement
+        self.displacement = displacement # The bird's vertical velocity, kept for the extended network inputs
+
+        """
+        # Adjusting the bird's tilt based on its vertical movement. If displacement is negative (indicating the bird is
+        moving upwards) or if the bird's current y-position is above its jump height plus 50 pixels, tilt the bird
+        upwards to simulate a flapping motion. Once the bird starts descending beyond its jump height, tilt it downwards.
+        """
+        if displacement < 0 or self.y < self.height + 50:  # tilt up
+            if self.tilt < self.MAX_ROTATION:
+                """
+                Rather than gradually tilting the bird upwards due to the limited MAX_ROTATION of 25 degrees, the tilt
+                angle is immediately set to 25 degrees.
+                """
+                self.tilt = self.MAX_ROTATION
+        else: # If the bird is not moving upwards or we don't want it to tilt upwards, then tilt it downwards
+            """
+            If the bird is falling downward (displacement > 0), tilt it downwards up to 90 degrees. We do not limit
+            the tilt to MAX_ROTATION because we want the bird to tilt more significantly when diving down, giving the
+            appearance of a nose dive.
+            """
+            if self.tilt > -90:
+                self.tilt -= self.ROT_VEL # Decreases the bird's tilt angle to make it rotate downwards
+
+    """
+    Advance the wing flap animation by one frame. This runs every frame whether or not the game is drawn, since the
+    current animation frame also decides the bird's collision mask.
+    """
+    def animate(self):
+        self.img_count += 1 # Tracks how many frames the current bird image has been displayed for
+
+        """
+        Determines which bird image to display based on img_count for animation. The animation cycles through three
+        images (flapping wings) based on ANIMATION_TIME. When img_count reaches ANIMATION_TIME * 4 + 1, it resets to
+        create smooth animation loops.
+        """
+        if self.img_count <= self.ANIMATION_TIME:
+            self.frame = 0
+        elif self.img_count <= self.ANIMATION_TIME*2:
+            self.frame = 1
+        elif self.img_count <= self.ANIMATION_TIME*3:
+            self.frame = 2
+        elif self.img_count <= self.ANIMATION_TIME*4:
+            self.frame = 1
+        elif self.img_count == self.ANIMATION_TIME*4 + 1:
+            self.frame = 0
+            self.img_count = 0
+
+        # When the bird tilts almost 90 degrees downwards, it stops flapping its wings to simulate a nose dive
+        if self.tilt <= -80:
+            self.frame = 1 # Display the image where the wings are level
+            self.img_count = self.ANIMATION_TIME*2 # Reset img_count to continue the flapping animation smoothly
+
+    # Returns True if the bird has hit the floor or flown off the top of the screen
+    def out_of_bounds(self):
+        return self.y + BIRD_HEIGHT - 10 >= FLOOR or self.y < -50
+
+
+# The state of a pair of top and bottom pipes
+class PipeState:
+    GAP = 200 # GAP represents the vertical space between the upper and lower pipes
+    """
+    VEL represents the velocity at which the pipes move towards the bird, creating the illusion of the bird flying
+    forward in Flappy Bird.
+    """
+    VEL = 5
+
+    def __init__(self, x, height):
+        self.x = x
+        self.height = 0
+        self.top = 0 # y position of the top pipe's image
+        self.bottom = 0 # y position of the bottom pipe's image
+        self.passed = False # Flag to indicate if the bird has already passed this pipe
+        self.set_height(height)
+
+    """
+    Sets the height of the pipe and calculates positions for top and bottom pipes. The height comes from the course's 
+    PipeSchedule, and the gap between the top and the bottom pipe is GAP pixels.
+    """
+    def set_height(self, height):
+        self.height = height
+        self.top = self.height - PIPE_HEIGHT
+        self.bottom = self.height + self.GAP
+
+    # Update the horizontal position of the pipe based on its velocity
+    def move(self):
+        self.x -= self.VEL # Move the pipe to the left based on its velocity
+
+    """
+    True if the pipe's images overlap horizontally with the image of a bird at x. All birds share the same x, so a pipe
+    that is horizontally clear of one bird is clear of all of them.
+    """
+    def overlaps_x(self, x):
+        return self.x < x + BIRD_WIDTH and self.x + PIPE_WIDTH > x
+
+    """
+    True if the image of a bird at y fits vertically inside the gap. Nothing above the gap belongs to the bottom pipe and
+    nothing below it to the top pipe, so such a bird cannot touch either.
+    """
+    def in_gap(self, y):
+        row = round(y)
+        return row >= self.height and row + BIRD_HEIGHT <= self.bottom
+
+    """
+    Checks a bird against both pipes. The cheap bounding box tests run first (the broad phase) and only a bird that
+    neither test rules out reaches the pixel perfect mask test. stats counts what happened to the pair.
+    """
+    def collide(self, bird, stats=collision_stats):
+        stats.pairs += 1
+        if not self.overlaps_x(bird.x):
+            stats.x_rejected += 1
+            return False
+        if self.in_gap(bird.y):
+            stats.gap_accepted += 1
+            return False
+
+        stats.mask_tests += 1
+        hit = self.overlap(bird)
+        stats.hits += hit
+        return hit
+
+    """
+    Pixel perfect collision between a bird and both pipes, using the precomputed masks. The offsets are the positions
+    of the pipe images relative to the bird's image; overlap returns None if no opaque pixels of the two masks overlap.
+    """
+    def overlap(self, bird):
+        masks = collision_masks()
+        bird_mask = masks.bird[bird.frame]
+        top_offset = (self.x - bird.x, self.top - round(bird.y))
+        bottom_offset = (self.x - bird.x, self.bottom - round(bird.y))
+        b_point = bird_mask.overlap(masks.pipe_bottom, bottom_offset)
+        t_point = bird_mask.overlap(masks.pipe_top, top_offset)
+
+        return bool(b_point or t_point)
+
+
+# The state of the moving floor, made of two images that scroll together
+class BaseState:
+    VEL = 5 # Must match PipeState.VEL so the floor and the pipes scroll at the same speed
+    WIDTH = BASE_WIDTH
+
+    def __init__(self, y):
+        self.y = y
+        self.x1 = 0 # x-coordinate of the first base image, positioned at the start of the screen
+        self.x2 = self.WIDTH # x-coordinate of the second base image, positioned directly behind the first base
+
+    # Move floor so it looks like its scrolling
+    def move(self):
+        self.x1 -= self.VEL
+        self.x2 -= self.VEL
+
+        # Check if either base image has moved completely off-screen, then cycle it to the back
+        if self.x1 + self.WIDTH < 0:
+            self.x1 = self.x2 + self.WIDTH
+
+        if self.x2 + self.WIDTH < 0:
+            self.x2 = self.x1 + self.WIDTH
+
+
+"""
+The course of a game: the heights of its pipes, in the order the pipes appear. The heights are drawn from a random 
+number generator owned by the schedule and seeded with seed, so a seed always gives the same course, in any process. 
+The first PRECOMPUTED heights are drawn up front; a game that gets further draws more from the same generator, so the 
+course still only depends on the seed. Without a seed, one is drawn from the global random module.
+"""
+class PipeSchedule:
+    PRECOMPUTED = 256
+
+    def __init__(self, seed=None):
+        if seed is None:
+            seed = random.randrange(2**32)
+        self.seed = seed
+        self.rng = random.Random(seed)
+        self.heights = [self._draw() for _ in range(self.PRECOMPUTED)]
+
+    # Determine a random height for the top of the pipe within a range
+    def _draw(self):
+        return self.rng.randrange(50, 450)
+
+    # Height of the i-th pipe of the course
+    def __getitem__(self, i):
+        while i >= len(self.heights):
+            self.heights.append(self._draw())
+        return self.heights[i]
+
+
+"""
+A single game world shared by a population of birds. The bird, pipe and base classes can be swapped for subclasses
+(such as the renderers in AI_Flappy_Bird.py), everything else in the world is plain numbers. The methods starting with
+an underscore are everything that touches the birds, so BatchedSimulation can replace them with array operations.
+
+The pipes follow schedule, a PipeSchedule, or a new schedule made from seed if none is given. Nothing else in the world 
+is random, so worlds with the same schedule play out identically.
+"""
+class Simulation:
+    def __init__(self, n_birds, bird_class=BirdState, pipe_class=PipeState, base_class=BaseState, seed=None,
+                 schedule=None, timer=NULL_TIMER):
+        self.timer = timer # Receives the time spent in each phase of a frame (see profiling.py)
+        self.schedule = schedule if schedule is not None else PipeSchedule(seed)
+        self.pipe_count = 0 # Number of pipes created so far, the index of the next pipe's height in the schedule
+        self.pipe_class = pipe_class
+        self.birds = self._create_birds(n_birds, bird_class)
+        self.pipes = deque([self._new_pipe(PIPE_START_X)]) # Ordered by x, new pipes join on the right
+        self.base = base_class(FLOOR)
+        self.score = 0
+        self.frames = 0
+        self.pipe_ind = 0 # The index of next_pipe in self.pipes
+        self.next_pipe = self.pipes[0] # The pipe the birds look at when deciding whether to jump
+
+    """
+    Advances the world by one frame. actions holds one flag per bird in self.birds, True to make that bird jump before
+    it moves (None makes no bird jump). Birds that crash or fall are removed from self.birds, and their indices are
+    returned in a StepResult. Every bird is checked against every pipe and the floor once, so a frame costs time linear
+    in the number of birds. The time spent moving things, checking collisions and managing the pipes is reported to 
+    self.timer.
+    """
+    def step(self, actions=None):
+        timer = self.timer
+        self.frames += 1
+        """
+        Determine which pipe the birds should consider for their neural network input, based on their position
+        relative to the pipes at the start of the frame. The pipes are ordered by x, so it is the first pipe unless the 
+        birds have already flown past it.
+        """
+        self.pipe_ind = 0
+        if len(self.pipes) > 1 and BIRD_X > self.pipes[0].x + PIPE_WIDTH:
+            self.pipe_ind = 1
+        self.next_pipe = self.pipes[self.pipe_ind]
+        timer.lap("pipes")
+
+        if actions is not None:
+            self._jump(actions)
+        self._move_birds()
+        self.base.move()
+        timer.lap("physics")
+
+        crashed = set()
+        passed = False
+        for pipe in self.pipes: # Move each pipe and check it against every bird that has not crashed yet
+            pipe.move()
+            timer.lap("pipes")
+            crashed.update(self._collide(pipe, crashed))
+            timer.lap("collision")
+
+            if not pipe.passed and pipe.x < BIRD_X: # As soon as the birds pass a pipe, a new pipe is generated
+                pipe.passed = True
+                passed = True
+
+        if passed:
+            self.score += 1
+            self.pipes.append(self._new_pipe(WIN_WIDTH))
+
+        """
+        Pipes leave the screen in the order they came in, so only the leftmost ones can have moved off it. next_pipe is
+        never one of them, as the birds are still to its left, so pipe_ind is shifted to keep pointing at it.
+        """
+        while self.pipes[0].x + PIPE_WIDTH < 0:
+            self.pipes.popleft()
+            self.pipe_ind -= 1
+        timer.lap("pipes")
+
+        fell = self._fell(crashed)
+        alive = self._survivors(crashed, fell)
+        timer.lap("collision")
+        if crashed or fell:
+            self._remove(alive)
+        self._animate()
+        timer.lap("physics")
+
+        return StepResult(sorted(crashed), fell, passed, alive)
+
+    # The pipe after next_pipe, or None if it has not appeared yet
+    @property
+    def following_pipe(self):
+        return self.pipes[self.pipe_ind + 1] if self.pipe_ind + 1 < len(self.pipes) else None
+
+    """
+    Returns the neural network inputs for every bird in self.birds: BASIC_INPUTS, or EXTENDED_INPUTS if extended is 
+    True. The horizontal distance is measured from the bird's left edge to the pipe's, so it turns negative while the 
+    bird flies through the pipe.
+    """
+    def observe(self, extended=False):
+        pipe = self.next_pipe
+        if extended:
+            return [(bird.y, abs(bird.y - pipe.height), abs(bird.y - pipe.bottom), bird.displacement, pipe.x - bird.x)
+                    for bird in self.birds]
+        return [(bird.y, abs(bird.y - pipe.height), abs(bird.y - pipe.bottom)) for bird in self.birds]
+
+    # Creates the next pipe of the course at x
+    def _new_pipe(self, x):
+        pipe = self.pipe_class(x, self.schedule[self.pipe_count])
+        self.pipe_count += 1
+        return pipe
+
+    def _create_birds(self, n_birds, bird_class):
+        return [bird_class(BIRD_X, BIRD_Y) for _ in range(n_birds)]
+
+    def _jump(self, actions):
+        for bird, action in zip(self.birds, actions):
+            if action:
+                bird.jump()
+
+    def _move_birds(self):
+        for bird in self.birds:
+            bird.move()
+
+    """
+    Returns the indices of the birds that hit the given pipe, skipping the ones that already crashed this frame. If the 
+    pipe is horizontally clear of the birds, all of them are ruled out with a single test.
+    """
+    def _collide(self, pipe, crashed):
+        candidates = [i for i in range(len(self.birds)) if i not in crashed]
+        if not pipe.overlaps_x(BIRD_X):
+            collision_stats.pairs += len(candidates)
+            collision_stats.x_rejected += len(candidates)
+            return []
+        return [i for i in candidates if pipe.collide(self.birds[i])]
+
+    # Returns the indices of the birds that hit the floor or flew off the top of the screen
+    def _fell(self, crashed):
+        return [i for i, bird in enumerate(self.birds) if i not in crashed and bird.out_of_bounds()]
+
+    # Returns the flag list telling which birds survived the frame
+    def _survivors(self, crashed, fell):
+        alive = [True] * len(self.birds)
+        for i in crashed:
+            alive[i] = False
+        for i in fell:
+            alive[i] = False
+        return alive
+
+    def _remove(self, alive):
+        self.birds = [bird for bird, keep in zip(self.birds, alive) if keep]
+
+    def _animate(self):
+        for bird in self.birds:
+            bird.animate()
+
+
+"""
+The state of a whole population of birds, stored as NumPy arrays with one element per bird. Every method applies the
+same arithmetic as the matching BirdState method to all birds at once, so a frame costs a handful of array operations
+no matter how many birds there are.
+"""
+class BirdArrays:
+    ARRAYS = ("y", "tilt", "tick_count", "vel", "displacement", "height", "img_count", "frame") # The per bird arrays
+    MAX_ROTATION = BirdState.MAX_ROTATION
+    ROT_VEL = BirdState.ROT_VEL
+    ANIMATION_TIME = BirdState.ANIMATION_TIME
+
+    def __init__(self, n_birds, x=BIRD_X, y=BIRD_Y):
+        self.x = x # All birds share the same x position
+        self.y = np.full(n_birds, y, dtype=np.float64)
+        self.tilt = np.zeros(n_birds, dtype=np.int64)
+        self.tick_count = np.zeros(n_birds, dtype=np.int64)
+        self.vel = np.zeros(n_birds, dtype=np.float64)
+        self.displacement = np.zeros(n_birds, dtype=np.float64)
+        self.height = self.y.copy()
+        self.img_count = np.zeros(n_birds, dtype=np.int64)
+        self.frame = np.zeros(n_birds, dtype=np.int64)
+
+    def __len__(self):
+        return len(self.y)
+
+    # Make the birds selected by the boolean array mask jump
+    def jump(self, mask):
+        self.vel[mask] = -10.5
+        self.tick_count[mask] = 0
+        self.height[mask] = self.y[mask]
+
+    # Move every bird, see BirdState.move for how the displacement and the tilt are worked out
+    def move(self):
+        self.tick_count += 1
+        displacement = self.vel*self.tick_count + 0.5*(3)*self.tick_count**2
+        displacement[displacement >= 16] = 16 # Terminal velocity
+        displacement[displacement < 0] -= 2 # Ascend slightly more when moving upwards
+        self.y += displacement
+        self.displacement = displacement
+
+        tilt_up = (displacement < 0) | (self.y < self.height + 50)
+        self.tilt[tilt_up & (self.tilt < self.MAX_ROTATION)] = self.MAX_ROTATION
+        self.tilt[~tilt_up & (self.tilt > -90)] -= self.ROT_VEL
+
+    # Advance the wing flap animation of every bird, see BirdState.animate
+    def animate(self):
+        self.img_count += 1
+        count = self.img_count
+        t = self.ANIMATION_TIME
+        self.frame = np.select([count <= t, count <= t*2, count <= t*3, count <= t*4, count == t*4 + 1],
+                               [0, 1, 2, 1, 0], self.frame)
+        self.img_count[count == t*4 + 1] = 0
+
+        nose_dive = self.tilt <= -80
+        self.frame[nose_dive] = 1
+        self.img_count[nose_dive] = t*2
+
+    # Boolean array, True for the birds that hit the floor or flew off the top of the screen
+    def out_of_bounds(self):
+        return (self.y + BIRD_HEIGHT - 10 >= FLOOR) | (self.y < -50)
+
+    """
+    Boolean array, True for the birds selected by the boolean array check that hit the given pipe. This is the same
+    broad phase as PipeState.collide done in bulk: birds whose image is horizontally clear of the pipe, or vertically
+    inside the gap, are ruled out with array operations and only the remaining few are checked pixel by pixel.
+    """
+    def collide(self, pipe, check, stats=collision_stats):
+        hit = np.zeros(len(self.y), dtype=bool)
+        pairs = int(np.count_nonzero(check))
+        stats.pairs += pairs
+        if not pipe.overlaps_x(self.x):
+            stats.x_rejected += pairs
+            return hit
+
+        rows = np.round(self.y).astype(np.int64)
+        height, bottom = self.gap(pipe)
+        in_gap = (rows >= height) & (rows + BIRD_HEIGHT <= bottom)
+        candidates = np.flatnonzero(check & ~in_gap)
+        stats.gap_accepted += pairs - len(candidates)
+        stats.mask_tests += len(candidates)
+        for i in candidates:
+            hit[i] = pipe.overlap(self.view(i))
+        stats.hits += int(np.count_nonzero(hit))
+        return hit
+
+    # The top and bottom edges of the given pipe's gap, as seen by the birds
+    def gap(self, pipe):
+        return pipe.height, pipe.bottom
+
+    # The attributes of bird i that PipeState.overlap looks at
+    def view(self, i):
+        return _BirdView(self.x, self.y[i], self.frame[i])
+
+    # Keeps only the birds selected by the boolean array mask
+    def keep(self, mask):
+        for name in self.ARRAYS:
+            setattr(self, name, getattr(self, name)[mask])
+
+
+# The attributes of a single bird that PipeState.overlap looks at, for checking one bird of a BirdArrays
+_BirdView = namedtuple("_BirdView", ["x", "y", "frame"])
+
+
+"""
+A Simulation whose birds are stored in a BirdArrays instead of a list of BirdState objects, for stepping large 
+populations. It plays exactly the same game, but has nothing to draw: self.birds is a BirdArrays, actions can be a
+boolean array and observe() returns an array with one row of inputs per bird.
+"""
+class BatchedSimulation(Simulation):
+    def __init__(self, n_birds, pipe_class=PipeState, base_class=BaseState, seed=None, schedule=None,
+                 timer=NULL_TIMER):
+        super().__init__(n_birds, BirdArrays, pipe_class, base_class, seed, schedule, timer)
+
+    # The inputs of all birds in one array, with one row per bird, see Simulation.observe
+    def observe(self, extended=False):
+        pipe = self.next_pipe
+        y = self.birds.y
+        height, bottom = self.birds.gap(pipe) # The gap of every bird's own world, see MultiWorldSimulation
+        columns = [y, np.abs(y - height), np.abs(y - bottom)]
+        if extended:
+            columns += [self.birds.displacement, np.full(len(y), pipe.x - self.birds.x, dtype=np.float64)]
+        return np.column_stack(columns)
+
+    def _create_birds(self, n_birds, bird_class):
+        return bird_class(n_birds)
+
+    def _jump(self, actions):
+        self.birds.jump(np.asarray(actions, dtype=bool))
+
+    def _move_birds(self):
+        self.birds.move()
+
+    def _collide(self, pipe, crashed):
+        check = np.ones(len(self.birds), dtype=bool)
+        check[list(crashed)] = False
+        return np.flatnonzero(self.birds.collide(pipe, check)).tolist()
+
+    def _fell(self, crashed):
+        fell = self.birds.out_of_bounds()
+        fell[list(crashed)] = False
+        return np.flatnonzero(fell).tolist()
+
+    def _survivors(self, crashed, fell):
+        alive = np.ones(len(self.birds), dtype=bool)
+        alive[list(crashed)] = False
+        alive[fell] = False
+        return alive
+
+    def _remove(self, alive):
+        self.birds.keep(alive)
+
+    def _animate(self):
+        self.birds.animate()
+
+
+"""
+The birds of several worlds in one BirdArrays. world holds the index of the world every bird flies in, and the pipes 
+they are checked against are WorldPipes, which hold the heights of a pipe in every world.
+"""
+class WorldBirdArrays(BirdArrays):
+    ARRAYS = BirdArrays.ARRAYS + ("world",)
+
+    def __init__(self, world, x=BIRD_X, y=BIRD_Y):
+        super().__init__(len(world), x, y)
+        self.world = np.asarray(world, dtype=np.int64)
+
+    def gap(self, pipe):
+        return pipe.height[self.world], pipe.bottom[self.world]
+
+    def view(self, i):
+        return _WorldBirdView(self.x, self.y[i], self.frame[i], self.world[i])
+
+
+# A _BirdView that also tells which world the bird flies in
+_WorldBirdView = namedtuple("_WorldBirdView", ["x", "y", "frame", "world"])
+
+
+"""
+A pipe that exists in every world of a MultiWorldSimulation. Pipes move, appear and leave at the same time in every 
+world, so x is shared; height, top and bottom are arrays with one value per world, taken from each world's schedule.
+"""
+class WorldPipes(PipeState):
+    # Pixel perfect collision between a bird (a _WorldBirdView) and the pipe of the bird's world
+    def overlap(self, bird):
+        return PipeState(self.x, int(self.height[bird.world])).overlap(bird)
+
+
+"""
+Several independent worlds stepped together: every world has its own PipeSchedule and n_birds birds of its own, and 
+all the birds of all the worlds are stepped as one BirdArrays, so W worlds cost about as much Python work per frame as 
+one. The dynamics are those of BatchedSimulation (and so of BirdState and PipeState); a bird in a world plays exactly 
+the game it would play in a Simulation with that world's schedule.
+
+The birds are numbered world by world: bird k of world w is bird w * n_birds + k, so flying the same n_birds genomes in 
+every world evaluates each of them on len(schedules) courses at once. As in every Simulation, dead birds are removed 
+and birds.world tells which world each remaining bird belongs to. The score counts the pipes passed, which is the same 
+in every world since pipes appear at the same times everywhere.
+"""
+class MultiWorldSimulation(BatchedSimulation):
+    def __init__(self, n_birds, schedules, pipe_class=WorldPipes, base_class=BaseState, timer=NULL_TIMER):
+        self.schedules = list(schedules)
+        super().__init__(n_birds * len(self.schedules), pipe_class, base_class, schedule=self.schedules[0],
+                         timer=timer)
+
+    # Creates the next pipe of every world at x
+    def _new_pipe(self, x):
+        heights = np.array([schedule[self.pipe_count] for schedule in self.schedules], dtype=np.int64)
+        self.pipe_count += 1
+        return self.pipe_class(x, heights)
+
+    def _create_birds(self, n_birds, bird_class):
+        return WorldBirdArrays(np.repeat(np.arange(len(self.schedules)), n_birds // len(self.schedules)))
@@ -0,0 +1,95 @@
+"""
+Streaming training telemetry. TelemetryReporter appends one record per generation to a file, as soon as the generation
+has been evaluated, so a long run can be followed live (e.g. with tail -f) and plotted afterwards. Records are written
+as JSON Lines, or as CSV if the file name ends in .csv, and nothing is kept in memory between generations, so the
+reporter costs the same in the thousandth generation as in the first.
+
+Every record holds:
+- generation, and time: the wall clock time the record was written, in seconds since the epoch
+- population and species: the number of genomes and of species evaluated
+- best_fitness, mean_fitness and stdev_fitness of the generation's genomes
+- pipes: the most pipes a bird passed in the generation
+- frames: the number of frames simulated, summed over every simulation of the generation (a single shared one unless
+  the genomes were evaluated by worker processes, which simulate one game per genome)
+- eval_seconds: the wall time of the generation's evaluation, and sim_fps: frames / eval_seconds
+"""
+
+import csv
+import json
+import time
+
+import neat
+from neat.math_util import mean, stdev
+
+
+FIELDS = ("generation", "time", "population", "species", "best_fitness", "mean_fitness", "stdev_fitness", "pipes",
+          "frames", "eval_seconds", "sim_fps")
+
+
+"""
+The game statistics of the generation being evaluated, which neat does not pass on to reporters. eval_genomes (or the
+parallel evaluator, with the results of its workers) records every game it plays, and TelemetryReporter resets the
+counts at the start of every generation.
+"""
+class GenerationStats:
+    def __init__(self):
+        self.frames = 0
+        self.pipes = 0
+
+    def record(self, frames, pipes):
+        self.frames += frames
+        self.pipes = max(self.pipes, pipes)
+
+    def reset(self):
+        self.frames = 0
+        self.pipes = 0
+
+
+generation_stats = GenerationStats() # The statistics eval_genomes records its games in
+
+
+class TelemetryReporter(neat.reporting.BaseReporter):
+    def __init__(self, filename, stats=generation_stats):
+        self.filename = filename
+        self.stats = stats
+        self.csv = filename.lower().endswith(".csv")
+        self.generation = None
+        self.start = None
+
+    def start_generation(self, generation):
+        self.generation = generation
+        self.stats.reset()
+        self.start = time.perf_counter()
+
+    def post_evaluate(self, config, population, species, best_genome):
+        eval_seconds = time.perf_counter() - self.start
+        fitnesses = [genome.fitness for genome in population.values()]
+        record = {
+            "generation": self.generation,
+            "time": time.time(),
+            "population": len(population),
+            "species": len(species.species),
+            "best_fitness": best_genome.fitness,
+            "mean_fitness": mean(fitnesses),
+            "stdev_fitness": stdev(fitnesses),
+            "pipes": self.stats.pipes,
+            "frames": self.stats.frames,
+            "eval_seconds": eval_seconds,
+            "sim_fps": self.stats.frames / eval_seconds if eval_seconds > 0 else 0.0,
+        }
+        self.write(record)
+
+    """
+    Appends a record to the file, opening and closing the file for every record, so nothing is held open or buffered
+    between generations and every finished record can be read right away, even if the run is killed later. A CSV file
+    gets its header when it is empty, so a resumed run keeps appending to the same table.
+    """
+    def write(self, record):
+        with open(self.filename, "a", newline="") as f:
+            if self.csv:
+                writer = csv.DictWriter(f, fieldnames=FIELDS)
+                if f.tell() == 0:
+                    writer.writeheader()
+                writer.writerow(record)
+            else:
+                f.write(json.dumps(record) + "\n")
@@ -0,0 +1,73 @@
+"""
+Shared setup of the tests. The game's modules live in the repository root and are imported from there, and SDL's dummy
+video driver stands in for a display, so the tests run headless:
+
+    python -m pytest tests
+"""
+
+import os
+import random
+import sys
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import neat
+import pytest
+
+import AI_Flappy_Bird as game
+from benchmark import random_genomes # Shared with the network benchmark
+
+CONFIG_FILE = os.path.join(ROOT, "config_feedforward.txt")
+
+"""
+The weights of a genome that flies well with config_feedforward.txt: the bias of its output node and the weight of each
+input's connection to it. Genomes near it fly for very different lengths of time, which makes the fitness checks
+meaningful, unlike random genomes that all crash within a few frames.
+"""
+FLYER_BIAS = 0.12
+FLYER_WEIGHTS = {(-1, 0): 0.17, (-2, 0): 0.2, (-3, 0): -0.93}
+MAX_FRAMES = 1500 # Long enough for a few pipes, short enough that the best flyers do not slow the tests down
+
+
+@pytest.fixture
+def config():
+    return neat.config.Config(neat.DefaultGenome, neat.DefaultReproduction, neat.DefaultSpeciesSet,
+                              neat.DefaultStagnation, CONFIG_FILE)
+
+# Headless generations on a single course that end after MAX_FRAMES, whatever the genomes' fitness
+@pytest.fixture
+def headless(monkeypatch):
+    monkeypatch.setattr(game, "RENDER_EVERY", 0)
+    monkeypatch.setattr(game, "WORLDS", 1)
+    monkeypatch.setattr(game, "PROFILE", False)
+    monkeypatch.setattr(game, "MAX_FRAMES", MAX_FRAMES)
+    monkeypatch.setattr(game, "MAX_SCORE", None)
+    monkeypatch.setattr(game, "STOP_AT_THRESHOLD", False)
+    monkeypatch.setattr(game, "gen", 0)
+
+"""
+Creates n seeded genomes scattered around the flyer's weights, every other one mutated a few times so hidden nodes and
+disabled connections are covered too.
+"""
+def flyer_genomes(config, n, seed, noise=0.15):
+    random.seed(seed)
+    genomes = []
+    for key in range(n):
+        genome = config.genome_type(key)
+        genome.configure_new(config.genome_config)
+        genome.nodes[0].bias = FLYER_BIAS + random.gauss(0, noise)
+        for connection_key, weight in FLYER_WEIGHTS.items():
+            genome.connections[connection_key].weight = weight + random.gauss(0, noise)
+        if key % 2:
+            for _ in range(3):
+                genome.mutate(config.genome_config)
+        genomes.append(genome)
+    return genomes
+
+# The fitness of every genome after a generation of eval_genomes on the course drawn from seed
+def generation_fitness(genomes, config, seed):
+    random.seed(seed)
+    game.eval_genomes(list(enumerate(genomes)), config)
+    return [genome.fitness for genome in genomes]
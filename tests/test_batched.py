@@ -0,0 +1,22 @@
+"""
+The batched engine steps all birds at once as NumPy arrays and keeps their fitness in arrays too, and must play exactly
+the game of the scalar engine, which steps one bird at a time: every genome gets exactly the same fitness.
+"""
+
+import pytest
+
+import AI_Flappy_Bird as game
+from conftest import flyer_genomes, generation_fitness
+
+SEEDS = (0, 1, 2)
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_batched_and_scalar_engines_agree(config, headless, monkeypatch, seed):
+    genomes = flyer_genomes(config, 40, seed=10 + seed)
+    monkeypatch.setattr(game, "BATCHED", True)
+    batched = generation_fitness(genomes, config, seed)
+    monkeypatch.setattr(game, "BATCHED", False)
+    scalar = generation_fitness(genomes, config, seed)
+    assert batched == scalar
+    assert len(set(batched)) > 5 # The genomes really fly for different lengths of time
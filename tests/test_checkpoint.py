@@ -0,0 +1,42 @@
+"""
+A seeded run that is stopped and resumed from one of its checkpoints must continue exactly like the uninterrupted run:
+the same genomes, with the same fitness, generation after generation.
+"""
+
+import neat
+
+import AI_Flappy_Bird as game
+from conftest import CONFIG_FILE
+
+GENERATIONS = 5
+RESUME_AT = 2 # The checkpoint the interrupted run is resumed from
+MAX_FRAMES = 300 # Short enough that no genome reaches the config's fitness_threshold, which would end the runs early
+
+
+# Records the fitness of every genome of every generation the run evaluates
+class FitnessRecorder(neat.reporting.BaseReporter):
+    def __init__(self):
+        self.generations = {}
+        self.generation = None
+
+    def start_generation(self, generation):
+        self.generation = generation
+
+    def post_evaluate(self, config, population, species, best_genome):
+        self.generations[self.generation] = sorted((key, genome.fitness) for key, genome in population.items())
+
+def test_resumed_run_matches_uninterrupted_run(headless, monkeypatch, tmp_path):
+    monkeypatch.setattr(game, "GENERATIONS", GENERATIONS)
+    monkeypatch.setattr(game, "MAX_FRAMES", MAX_FRAMES)
+    monkeypatch.setattr(game, "BEST_GENOME_FILE", str(tmp_path / "best_genome.pkl"))
+    monkeypatch.setattr(game, "CHECKPOINT_PREFIX", str(tmp_path / "uninterrupted-"))
+    uninterrupted = FitnessRecorder()
+    game.run(CONFIG_FILE, workers=1, seed=7, reporters=[uninterrupted], pop_size=30)
+
+    monkeypatch.setattr(game, "CHECKPOINT_PREFIX", str(tmp_path / "resumed-"))
+    resumed = FitnessRecorder()
+    game.run(CONFIG_FILE, workers=1, resume=str(tmp_path / "uninterrupted-{}".format(RESUME_AT)), reporters=[resumed])
+
+    assert sorted(resumed.generations) == list(range(RESUME_AT + 1, GENERATIONS))
+    for generation, fitness in resumed.generations.items():
+        assert fitness == uninterrupted.generations[generation]
@@ -0,0 +1,41 @@
+"""
+The collision broad phase rules out the bird/pipe pairs that cannot touch before the pixel perfect mask test, and must
+never change the outcome of a collision. CollisionStats counts what it did with every pair, the same way for a single
+bird (PipeState.collide) and for a whole BirdArrays.
+"""
+
+import numpy as np
+
+from simulation import BIRD_X, PIPE_WIDTH, BirdState, PipeState, BirdArrays, CollisionStats
+
+
+def test_broad_phase_counts():
+    stats = CollisionStats()
+    pipe = PipeState(BIRD_X - 20, 300) # Overlaps the birds horizontally, with the gap between y = 300 and 500
+    assert not pipe.collide(BirdState(BIRD_X, 350), stats) # Inside the gap
+    assert pipe.collide(BirdState(BIRD_X, 100), stats) # In the top pipe
+    assert pipe.collide(BirdState(BIRD_X, 480), stats) # Half in the bottom pipe
+    assert not PipeState(BIRD_X + 200, 300).collide(BirdState(BIRD_X, 100), stats) # Clear of the pipe
+    assert (stats.pairs, stats.x_rejected, stats.gap_accepted, stats.mask_tests, stats.hits) == (4, 1, 1, 2, 2)
+    assert stats.eliminated() == 2
+
+def test_broad_phase_never_changes_a_collision():
+    rng = np.random.RandomState(0)
+    single, batched = CollisionStats(), CollisionStats()
+    birds = BirdArrays(300)
+    for x in range(BIRD_X - PIPE_WIDTH - 10, BIRD_X + 100, 7): # The pipe sweeps past the birds
+        birds.y = rng.uniform(-50, 730, len(birds))
+        birds.frame = rng.randint(0, 3, len(birds))
+        check = rng.rand(len(birds)) < 0.9
+        pipe = PipeState(x, rng.randint(50, 450))
+
+        hit = birds.collide(pipe, check, batched)
+        for i in range(len(birds)):
+            bird = birds.view(i)
+            if check[i]:
+                assert hit[i] == pipe.collide(bird, single) == pipe.overlap(bird)
+            else:
+                assert not hit[i]
+
+    assert vars(batched) == vars(single)
+    assert batched.hits > 0 and batched.x_rejected > 0 and batched.gap_accepted > 0
@@ -0,0 +1,47 @@
+"""
+The compiled networks must give the outputs of neat's own networks. They are identical up to Python 3.11; from 3.12 on,
+neat's sum() aggregation uses compensated summation and can differ in the last bits (see network.py), so the outputs
+are compared with a tolerance far below anything that could change a bird's jump.
+"""
+
+import neat
+import numpy as np
+from numpy.testing import assert_allclose
+
+from network import BatchedNetworks
+from conftest import random_genomes, flyer_genomes
+
+ATOL = 1e-12
+
+
+def neat_outputs(genomes, config, inputs):
+    nets = [neat.nn.FeedForwardNetwork.create(genome, config) for genome in genomes]
+    return np.array([net.activate(list(row)) for net, row in zip(nets, inputs)], dtype=np.float64)
+
+def test_batched_networks_match_neat(config):
+    genomes = random_genomes(config, 200, seed=1, mutations=20) + flyer_genomes(config, 50, seed=2)
+    rng = np.random.RandomState(3)
+    nets = BatchedNetworks.create(genomes, config)
+    for _ in range(5):
+        inputs = rng.uniform(0, 700, (len(genomes), 3))
+        assert_allclose(nets.activate(inputs), neat_outputs(genomes, config, inputs), rtol=0, atol=ATOL)
+
+def test_kept_networks_match_neat(config):
+    genomes = random_genomes(config, 60, seed=4, mutations=20)
+    mask = np.random.RandomState(5).rand(len(genomes)) < 0.5
+    kept = [genome for genome, keep in zip(genomes, mask) if keep]
+    inputs = np.random.RandomState(6).uniform(0, 700, (len(kept), 3))
+    nets = BatchedNetworks.create(genomes, config).keep(mask)
+    assert_allclose(nets.activate(inputs), neat_outputs(kept, config, inputs), rtol=0, atol=ATOL)
+
+def test_repeatedly_kept_networks_match_neat(config):
+    genomes = random_genomes(config, 80, seed=7, mutations=20)
+    nets = BatchedNetworks.create(genomes, config)
+    rng = np.random.RandomState(8)
+    while len(genomes) > 1: # Drop networks a few at a time, like birds dying frame after frame
+        mask = rng.rand(len(genomes)) < 0.8
+        mask[0] = True
+        genomes = [genome for genome, keep in zip(genomes, mask) if keep]
+        nets = nets.keep(mask)
+        inputs = rng.uniform(0, 700, (len(genomes), 3))
+        assert_allclose(nets.activate(inputs), neat_outputs(genomes, config, inputs), rtol=0, atol=ATOL)
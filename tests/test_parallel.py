@@ -0,0 +1,36 @@
+"""
+Parallel runs play every genome on its own: eval_genome, which plays one genome at a time like the workers, and the
+workers of SeededParallelEvaluator must give every genome exactly the fitness it gets in a shared generation.
+"""
+
+import random
+
+import pytest
+
+import AI_Flappy_Bird as game
+from simulation import PipeSchedule
+from conftest import flyer_genomes, generation_fitness
+
+SEEDS = (0, 1, 2)
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_eval_genome_matches_generation(config, headless, seed):
+    genomes = flyer_genomes(config, 40, seed=10 + seed)
+    generation = generation_fitness(genomes, config, seed)
+
+    random.seed(seed)
+    schedule = PipeSchedule(random.randrange(2**32)) # The course eval_genomes draws for the generation
+    limits = game.generation_limits(config)
+    assert [game.eval_genome(genome, config, schedule, limits) for genome in genomes] == generation
+
+def test_parallel_evaluator_matches_generation(config, headless):
+    genomes = flyer_genomes(config, 40, seed=20)
+    generation = generation_fitness(genomes, config, seed=3)
+
+    evaluator = game.SeededParallelEvaluator(2, game.play_genome)
+    random.seed(3)
+    evaluator.evaluate(list(enumerate(genomes)), config)
+    evaluator.pool.close()
+    evaluator.pool.join()
+    assert [genome.fitness for genome in genomes] == generation
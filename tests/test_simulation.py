@@ -0,0 +1,37 @@
+"""
+The game's physics live in the pygame-free engine (see simulation.py). Drawn generations fly the Bird, Pipe and Base
+classes, which only add images and drawing on top of the engine's state classes, so they must play exactly the game of
+a headless generation: every genome gets exactly the same fitness.
+"""
+
+import pytest
+
+import AI_Flappy_Bird as game
+from simulation import Simulation, BatchedSimulation
+from conftest import flyer_genomes, generation_fitness
+
+
+def test_drawn_and_headless_generations_agree(config, headless, monkeypatch):
+    genomes = flyer_genomes(config, 20, seed=30)
+    monkeypatch.setattr(game, "BATCHED", False)
+    headless_fitness = generation_fitness(genomes, config, seed=4)
+
+    monkeypatch.setattr(game, "RENDER_EVERY", 1)
+    monkeypatch.setattr(game, "FPS", None)
+    assert generation_fitness(genomes, config, seed=4) == headless_fitness
+    assert len(set(headless_fitness)) > 3 # The genomes really fly for different lengths of time
+
+"""
+pipe_ind must point at next_pipe, and following_pipe be the pipe after it, at the end of every frame, including the
+frames in which a pipe leaves the screen and the pipes shift in the deque.
+"""
+@pytest.mark.parametrize("simulation", [Simulation, BatchedSimulation])
+def test_pipe_index_follows_the_pipes(simulation):
+    sim = simulation(0, seed=1) # No birds, so the game never ends
+    for _ in range(3000):
+        sim.step()
+        pipes = list(sim.pipes)
+        following = pipes.index(sim.next_pipe) + 1
+        assert sim.pipes[sim.pipe_ind] is sim.next_pipe
+        assert sim.following_pipe is (pipes[following] if following < len(pipes) else None)
+    assert sim.score > 30
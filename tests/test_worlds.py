@@ -0,0 +1,39 @@
+"""
+With WORLDS above 1, every genome flies several courses at once in a MultiWorldSimulation, and its fitness must be
+exactly the mean of the fitness it gets on each course on its own, both in a shared generation and in play_genome_worlds,
+which plays one genome at a time like the workers of a parallel run.
+"""
+
+import random
+
+import AI_Flappy_Bird as game
+from simulation import PipeSchedule
+from conftest import flyer_genomes, generation_fitness
+
+WORLDS = 3
+
+
+# The courses eval_genomes draws for the generation of the given seed
+def generation_schedules(seed):
+    random.seed(seed)
+    return [PipeSchedule(random.randrange(2**32)) for _ in range(WORLDS)]
+
+def test_multi_world_fitness_is_the_mean_of_the_courses(config, headless, monkeypatch):
+    genomes = flyer_genomes(config, 30, seed=40)
+    monkeypatch.setattr(game, "WORLDS", WORLDS)
+    generation = generation_fitness(genomes, config, seed=5)
+
+    limits = game.generation_limits(config)
+    courses = [[game.eval_genome(genome, config, schedule, limits) for schedule in generation_schedules(5)]
+               for genome in genomes]
+    assert generation == [(first + second + third) / WORLDS for first, second, third in courses]
+    assert any(len(set(fitness)) > 1 for fitness in courses) # The courses really differ
+
+def test_play_genome_worlds_matches_generation(config, headless, monkeypatch):
+    genomes = flyer_genomes(config, 30, seed=41)
+    monkeypatch.setattr(game, "WORLDS", WORLDS)
+    generation = generation_fitness(genomes, config, seed=6)
+
+    schedules = generation_schedules(6)
+    limits = game.generation_limits(config)
+    assert [game.eval_genome_worlds(genome, config, schedules, limits) for genome in genomes] == generation